@@ -0,0 +1,4 @@
+"""
+PrimeTower data layer – sheet access and computation shared by the
+Streamlit dashboard (Pilot_v2.py) and headless tooling.
+"""
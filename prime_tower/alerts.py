@@ -0,0 +1,83 @@
+"""
+Vectorized alerts engine behind the Alerts page.
+
+All rankings come from one grouped pass per entity (truck, route) over
+the trip fact table plus one over the fuel ledger. Passing ``by=["Year-Month"]``
+evaluates every month in the same passes (batch mode), so the cost stays
+flat as routes, trucks and months grow.
+"""
+
+import pandas as pd
+
+from prime_tower import fuel, rules
+
+TOP_N = 3
+
+
+def _rank(df, by, column, n, ascending):
+    """Top ``n`` rows by ``column`` within each ``by`` group (or overall)."""
+    ranked = df.dropna(subset=[column]).sort_values(list(by) + [column], ascending=[True] * len(by) + [ascending])
+    return (ranked.groupby(list(by), observed=True, sort=False).head(n) if by else ranked.head(n)).reset_index(drop=True)
+
+
+def evaluate_alerts(cost_df, fuel_ledger, by=()):
+    """
+    Evaluate every alert ranking.
+
+    Returns a dict of DataFrames: ``top_truck``, ``top_route``,
+    ``inefficient_trucks``, ``loss_routes`` and ``pricing``. With ``by``
+    (e.g. ``["Year-Month"]``) each result carries those columns and holds
+    the ranking for every group.
+    """
+    by = list(by)
+    empty = pd.DataFrame()
+    results = dict.fromkeys(["top_truck", "top_route", "inefficient_trucks", "loss_routes", "pricing"], empty)
+
+    if not cost_df.empty:
+        trucks = (
+            cost_df.groupby(by + ["TruckID", "Driver Name"], observed=True)["Profit (R)"]
+            .sum().astype(float).reset_index()
+        )
+        routes = (
+            cost_df.groupby(by + ["Route Code"], observed=True)
+            .agg(**{
+                "Profit (R)": ("Profit (R)", "mean"),
+                "Total Profit (R)": ("Profit (R)", "sum"),
+                "Rate per ton": ("Rate per ton", "mean"),
+                "Ton Reg": ("Ton Reg", "sum")
+            })
+            .reset_index()
+        )
+        routes[["Profit (R)", "Total Profit (R)", "Rate per ton", "Ton Reg"]] = (
+            routes[["Profit (R)", "Total Profit (R)", "Rate per ton", "Ton Reg"]].astype(float)
+        )
+
+        results["top_truck"] = _rank(trucks, by, "Profit (R)", 1, ascending=False)
+        results["top_route"] = _rank(routes[by + ["Route Code", "Profit (R)"]], by, "Profit (R)", 1, ascending=False)
+        results["loss_routes"] = _rank(
+            routes[by + ["Route Code", "Total Profit (R)"]].rename(columns={"Total Profit (R)": "Profit (R)"}),
+            by, "Profit (R)", TOP_N, ascending=True
+        )
+
+        # Route rules (high-volume pricing review) run over every route-month at once
+        flagged = rules.evaluate_rules(routes.fillna({"Rate per ton": 0, "Profit (R)": 0, "Ton Reg": 0}), "routes", by)
+        results["pricing"] = flagged[flagged["Pricing Review"]][
+            by + ["Route Code", "Rate per ton", "Suggested Rate", "Profit (R)", "Ton Reg"]
+        ].reset_index(drop=True)
+
+    if not fuel_ledger.empty:
+        # Fill-to-fill km/L weighted by distance, so a short top-up does not skew a truck's figure
+        efficiency = fuel.efficiency(fuel_ledger, by + ["TruckID", "Driver Name"])
+        results["inefficient_trucks"] = _rank(
+            efficiency[by + ["TruckID", "Driver Name", "Fuel Efficiency (km/L)"]], by, "Fuel Efficiency (km/L)", TOP_N, ascending=True
+        )
+
+    return results
+
+
+def slice_alerts(results, month, by="Year-Month"):
+    """Pick one month out of a batch ``evaluate_alerts`` result."""
+    return {
+        name: (df[df[by] == month].drop(columns=by).reset_index(drop=True) if by in df.columns else df)
+        for name, df in results.items()
+    }
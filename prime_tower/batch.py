@@ -0,0 +1,187 @@
+"""
+Headless batch runner: precompute every page's KPIs and alerts per month,
+plus tonnage forecasts per route and truck and the workshop calendar.
+
+Usage::
+
+    python -m prime_tower.batch --credentials service_account.json --out reports
+    python -m prime_tower.batch --demo data --months 2024-01 2024-06 --format parquet csv
+
+Loading from Sheets also refreshes the on-disk snapshot, so a nightly run
+leaves the dashboard a fresh snapshot to serve in the morning. Months are
+evaluated concurrently over trip facts and a cube built once.
+"""
+
+import argparse
+import functools
+import json
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+
+from prime_tower import alerts, cube, forecast, fuel, loader, model, rules, schema, service, snapshot
+from prime_tower.filters import FilterIndex
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("parquet", "csv", "json")
+DEMO_TABLES = ("operations", "tracker", "loi", "truck_pak", "vcs")
+
+# Set in each worker by _init_worker; processes receive it once, not per month
+_shared = {}
+
+
+def fetch_from_sheets(creds_info):
+    tables, _ = loader.load_source_tables(creds_info)
+    return tables
+
+
+def load_tables(credentials=None, demo_dir=None, snapshot_dir=None):
+    """Source tables plus the data version they belong to."""
+    if demo_dir:
+        tables = [pd.read_csv(os.path.join(demo_dir, f"demo_{name}.csv")) for name in DEMO_TABLES]
+        version = "demo"
+    else:
+        fetch = None
+        if credentials:
+            with open(credentials) as f:
+                fetch = functools.partial(fetch_from_sheets, json.load(f))
+        store = snapshot.SnapshotStore(fetch, directory=snapshot_dir)
+        version = store.refresh() if fetch else store.version()
+        if version is None:
+            raise RuntimeError("No snapshot on disk; pass --credentials to load from Google Sheets")
+        tables = store.read()
+    tables, _ = schema.apply_schemas(tables)
+    return tables, version
+
+
+def prepare(tables):
+    """Everything shared across months, built once."""
+    operations, tracker, loi, truck_pak, vcs = tables
+    ops, month_dict = model.prepare_operations(operations)
+    trip_facts = model.build_trip_facts(ops, tracker, loi, truck_pak, vcs)
+    month_cube = cube.build_monthly_cube(trip_facts, loi)
+    fuel_ledger = fuel.build_fuel_ledger(ops, tracker, truck_pak, loi)
+    return {
+        "operations": ops,
+        "month_dict": month_dict,
+        "trip_facts": FilterIndex(trip_facts),
+        "month_cube": FilterIndex(month_cube),
+        "fuel_ledger": FilterIndex(fuel_ledger)
+    }
+
+
+def _init_worker(shared):
+    _shared.update(shared)
+
+
+def evaluate_month(month):
+    """KPIs and alerts for one month, as (kpi row, {alert name: frame})."""
+    month_cube = _shared["month_cube"].apply(month)
+    facts = _shared["trip_facts"].apply(month)
+    fuel_ledger = _shared["fuel_ledger"].apply(month)
+
+    row = {"Year-Month": month}
+    for section, kpis in (
+        ("financials", cube.financial_kpis(month_cube)),
+        ("operations", cube.operations_kpis(month_cube)),
+        ("fuel", fuel.fleet_kpis(fuel_ledger))
+    ):
+        row.update({f"{section}_{name}": value for name, value in kpis.items()})
+
+    results = alerts.evaluate_alerts(facts, fuel_ledger)
+    return row, {name: df.assign(**{"Year-Month": month}) for name, df in results.items() if not df.empty}
+
+
+def select_months(month_dict, start=None, end=None):
+    months = list(month_dict.values())
+    return [m for m in months if (start is None or m >= start) and (end is None or m <= end)]
+
+
+def write_table(df, out_dir, name, formats):
+    for fmt in formats:
+        path = os.path.join(out_dir, f"{name}.{fmt}")
+        tmp_path = path + ".tmp"
+        if fmt == "parquet":
+            snapshot.arrow_safe(df).to_parquet(tmp_path, index=False)
+        elif fmt == "csv":
+            df.to_csv(tmp_path, index=False)
+        else:
+            df.to_json(tmp_path, orient="records", date_format="iso", indent=1)
+        os.replace(tmp_path, path)
+
+
+def run(tables, version, out_dir, first=None, last=None, formats=("parquet",), workers=4, executor="thread"):
+    """Evaluate months ``first``..``last`` (default: all) and write the results; returns the manifest."""
+    start = time.perf_counter()
+    shared = prepare(tables)
+    # Forecasts fit over the whole history, not per month; workers only need the indexes
+    operations = shared.pop("operations")
+    months = select_months(shared["month_dict"], first, last)
+    logger.info(f"Evaluating {len(months)} months of data version {version} with {workers} {executor} workers")
+
+    if executor == "process":
+        # Spawned like the forecast pool, so the run behaves the same on every platform
+        pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,),
+                                   mp_context=multiprocessing.get_context("spawn"))
+    else:
+        pool = ThreadPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(shared,))
+    with pool:
+        evaluated = list(pool.map(evaluate_month, months))
+
+    os.makedirs(out_dir, exist_ok=True)
+    outputs = {"kpis": pd.DataFrame([row for row, _ in evaluated])}
+    for name in ("top_truck", "top_route", "inefficient_trucks", "loss_routes", "pricing"):
+        frames = [results[name] for _, results in evaluated if name in results]
+        outputs[f"alerts_{name}"] = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    forecasts = forecast.fit_forecasts(operations, workers=workers if executor == "process" else 1)
+    for entity in forecast.ENTITIES:
+        outputs[f"forecast_{entity}"] = forecasts.frame(entity)
+    # Truck rules are not monthly; evaluated once as of today
+    today = pd.Timestamp.today().normalize()
+    outputs["maintenance"] = rules.evaluate_rules(rules.truck_status(tables[3], today), "trucks")
+    projection = service.project_services(tables[3], service.daily_km_rates(operations, tables[1], tables[2]), today)
+    outputs["service_calendar"] = service.service_calendar(projection, today)
+    for name, df in outputs.items():
+        write_table(df, out_dir, name, formats)
+
+    manifest = {
+        "data_version": version,
+        "months": months,
+        "formats": list(formats),
+        "tables": sorted(outputs),
+        "generated_at": pd.Timestamp.now().isoformat(),
+        "elapsed_seconds": round(time.perf_counter() - start, 3)
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=1)
+    logger.info(f"Wrote {len(outputs)} tables to {out_dir} in {manifest['elapsed_seconds']:.2f}s")
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute PrimeTower KPIs and alerts per month.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--credentials", help="service account JSON; loads from Google Sheets and refreshes the snapshot")
+    source.add_argument("--demo", metavar="DIR", help="read demo_*.csv files from DIR instead")
+    parser.add_argument("--snapshot-dir", help="snapshot directory (default: under PRIMETOWER_DATA_DIR)")
+    parser.add_argument("--months", nargs=2, metavar=("FIRST", "LAST"), help="inclusive YYYY-MM range (default: all)")
+    parser.add_argument("--out", default="reports", help="output directory")
+    parser.add_argument("--format", nargs="+", choices=FORMATS, default=["parquet"], dest="formats")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--executor", choices=("thread", "process"), default="thread")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    tables, version = load_tables(args.credentials, args.demo, args.snapshot_dir)
+    first, last = (pd.Period(m, freq="M").strftime("%Y-%m") for m in args.months) if args.months else (None, None)
+    manifest = run(tables, version, args.out, first, last, args.formats, args.workers, args.executor)
+    print(json.dumps(manifest, indent=1))
+
+
+if __name__ == "__main__":
+    main()
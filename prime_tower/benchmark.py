@@ -0,0 +1,122 @@
+"""
+Pipeline benchmarks on synthetic fleets of increasing size.
+
+Times each stage a dashboard rerun or data load goes through: CSV load
+with schema coercion, operations prep, the trip fact merges (Financials)
+and monthly cube, filter index build and lookups, the alert merges and
+rankings, and Plotly figure building plus serialization::
+
+    python -m prime_tower.benchmark --scales small medium large --out bench.csv
+
+Each stage reports the best of ``--repeat`` runs, in seconds.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+import plotly.express as px
+import plotly.io as pio
+
+from prime_tower import alerts, cube, fuel, model, pricing, schema, synthetic
+from prime_tower.filters import FilterIndex
+
+DEFAULT_SCALES = ("small", "medium")
+
+
+def best_of(repeat, fn):
+    """Run ``fn`` ``repeat`` times; return (best seconds, last result)."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _lookups(index, month_dict, trucks, routes):
+    # Positions plus iloc, what the dashboard runs on a SharedStore miss
+    for month in month_dict.values():
+        index.apply(month)
+        index.apply(month, truck=trucks[0])
+        index.apply(month, route=routes[0])
+    return len(month_dict) * 3
+
+
+def _figures(month_cube, ops, month):
+    tons = cube.tons_per_truck(month_cube)
+    daily = ops[(ops["Year-Month"] == month) & (ops["Doc Type"] == "Offloading")].groupby("Date_only")["Ton Reg"].sum().reset_index()
+    figures = [
+        px.bar(tons, x="TruckID", y="Ton Reg", color="Ton Reg", hover_name="Driver Name"),
+        px.line(daily, x="Date_only", y="Ton Reg", markers=True, line_shape="spline")
+    ]
+    return [pio.to_json(fig, validate=False) for fig in figures]
+
+
+def run_scale(scale, trucks, months, repeat=3, seed=0):
+    """Time every stage at one fleet size; returns a list of result rows."""
+    tables = synthetic.generate_fleet(trucks, months, seed=seed)
+    rows = []
+
+    def record(stage, fn, **extra):
+        seconds, result = best_of(repeat, fn)
+        rows.append({"scale": scale, "trucks": trucks, "months": months, "stage": stage, "seconds": seconds, **extra})
+        return result
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic.write_demo(tables, directory)
+        paths = [os.path.join(directory, f"demo_{name}.csv") for name in synthetic.TABLE_NAMES]
+        tables = record("load (csv + schema)", lambda: schema.apply_schemas([pd.read_csv(p) for p in paths])[0],
+                        rows=len(tables[0]))
+    operations, tracker, loi, truck_pak, vcs = tables
+
+    ops, month_dict = record("prep operations", lambda: model.prepare_operations(operations))
+    facts = record("trip facts (financials merge)", lambda: model.build_trip_facts(ops, tracker, loi, truck_pak, vcs),
+                   rows=len(ops))
+    month_cube = record("monthly cube", lambda: cube.build_monthly_cube(facts, loi))
+    index = record("filter index build", lambda: FilterIndex(facts))
+    truck_ids = list(truck_pak["TruckID"].dropna().unique())
+    route_ids = list(loi["Route Code"].dropna().unique())
+    lookups = _lookups(index, month_dict, truck_ids, route_ids)
+    record("filter lookups (positions + iloc)", lambda: _lookups(index, month_dict, truck_ids, route_ids), lookups=lookups)
+    ledger = record("fuel ledger (fill-to-fill)", lambda: fuel.build_fuel_ledger(ops, tracker, truck_pak, loi))
+    record("alerts (all months)", lambda: alerts.evaluate_alerts(facts, ledger, by=["Year-Month"]))
+    scenarios = pricing.cost_scenarios(fuel=[c / 100 for c in range(-20, 51, 2)], fixed=[c / 100 for c in range(0, 21, 5)])
+    record("pricing what-if", lambda: pricing.simulate(pricing.route_basis(facts), scenarios=scenarios),
+           scenarios=len(scenarios) * len(pricing.DEFAULT_MULTIPLIERS))
+
+    last_month = list(month_dict.values())[-1]
+    month_slice = FilterIndex(month_cube).apply(last_month)
+    record("figures (build + serialize)", lambda: _figures(month_slice, ops, last_month))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the PrimeTower data pipeline on synthetic fleets.")
+    parser.add_argument("--scales", nargs="+", choices=synthetic.SCALES, default=list(DEFAULT_SCALES))
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="also write the results to this .csv or .json file")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for scale in args.scales:
+        trucks, months = synthetic.SCALES[scale]
+        print(f"Benchmarking {scale}: {trucks} trucks, {months} months")
+        rows += run_scale(scale, trucks, months, args.repeat, args.seed)
+
+    results = pd.DataFrame(rows)
+    print(results.pivot(index="stage", columns="scale", values="seconds")
+          .reindex(columns=args.scales).reindex(results["stage"].unique())
+          .to_string(float_format="{:.4f}".format))
+    if args.out:
+        if args.out.endswith(".json"):
+            results.to_json(args.out, orient="records", indent=1)
+        else:
+            results.to_csv(args.out, index=False)
+
+
+if __name__ == "__main__":
+    main()
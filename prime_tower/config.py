@@ -0,0 +1,37 @@
+"""
+Runtime settings for the PrimeTower data layer, overridable via environment.
+"""
+
+import os
+
+
+def _env_flag(name, default):
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.strip().lower() not in ("0", "false", "no", "off", "")
+
+
+# Local directory for persisted frames and sync state
+DATA_DIR = os.environ.get("PRIMETOWER_DATA_DIR", ".primetower")
+
+# Append-only sync of the operations sheet instead of full reloads
+INCREMENTAL_SYNC = _env_flag("PRIMETOWER_INCREMENTAL_SYNC", True)
+
+# Seconds before the on-disk snapshot of the source tables counts as stale
+SNAPSHOT_TTL = int(os.environ.get("PRIMETOWER_SNAPSHOT_TTL", "900"))
+
+# Seconds between checks of the spreadsheet's modified time; 0 disables the scheduler
+REFRESH_INTERVAL = int(os.environ.get("PRIMETOWER_REFRESH_INTERVAL", "120"))
+
+# Memory cap for derived datasets shared across sessions
+SHARED_STORE_MB = int(os.environ.get("PRIMETOWER_SHARED_STORE_MB", "512"))
+
+# Show the per-rerun timing panel in the sidebar (also enabled by ?admin=1)
+PROFILING_PANEL = _env_flag("PRIMETOWER_PROFILING_PANEL", False)
+
+# Per-truck daily distance rolled up from GPS pings; used instead of the tracker sheet when present
+GPS_STORE = os.environ.get("PRIMETOWER_GPS_STORE", os.path.join(DATA_DIR, "gps_daily.arrow"))
+
+# Processes fitting tonnage forecasts; 0 uses every CPU
+FORECAST_WORKERS = int(os.environ.get("PRIMETOWER_FORECAST_WORKERS", "0"))
@@ -0,0 +1,106 @@
+"""
+Monthly cube: trip measures pre-aggregated over month × truck × route × Doc Type.
+
+Built once per data load from the trip fact table. KPI cards and the
+per-truck / per-route charts read from the (filtered) cube, whose size
+depends on the number of trucks and routes rather than on trip history.
+Means are stored as sum and count so they stay exact after re-aggregation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from prime_tower.model import lookup_table
+
+CUBE_DIMENSIONS = ["Year-Month", "TruckID", "Route Code", "Doc Type"]
+
+# Measures stored as sums; those also averaged get a non-null count
+SUM_MEASURES = [
+    "Ton Reg", "Route Distance (km)", "Revenue (R)", "Variable Cost (R)",
+    "Daily Fixed Cost (R/day)", "Total Cost (R)", "Profit (R)", "Cost per km (R/km)"
+]
+MEAN_MEASURES = ["Revenue (R)", "Total Cost (R)", "Profit (R)", "Cost per km (R/km)"]
+
+OFFLOADING = "Offloading"
+
+
+def build_monthly_cube(trip_facts, loi):
+    facts = trip_facts
+    if "Distance (km)" in loi.columns:
+        route_distance = lookup_table(loi, "Route Code", ["Distance (km)"], "loi").rename(
+            columns={"Distance (km)": "Route Distance (km)"})
+        facts = facts.merge(route_distance, on="Route Code", how="left", validate="many_to_one")
+        facts["Route Distance (km)"] = pd.to_numeric(facts["Route Distance (km)"], errors="coerce")
+    else:
+        facts = facts.assign(**{"Route Distance (km)": 0.0})
+    facts = facts.assign(**{"Cost per km (R/km)": facts["Total Cost (R)"] / facts["Distance (km)"]})
+
+    aggregations = {"Trips": ("Ton Reg", "size"), "First Date": ("Date", "min"), "Last Date": ("Date", "max")}
+    for col in SUM_MEASURES:
+        aggregations[f"{col} sum"] = (col, "sum")
+    for col in MEAN_MEASURES:
+        aggregations[f"{col} count"] = (col, "count")
+
+    return (
+        facts.groupby(CUBE_DIMENSIONS + ["Driver Name"], dropna=False, observed=True, sort=False)
+        .agg(**aggregations)
+        .reset_index()
+    )
+
+
+def _mean(cube, col):
+    count = cube[f"{col} count"].sum()
+    return cube[f"{col} sum"].sum() / count if count else np.nan
+
+
+def date_range(cube):
+    return cube["First Date"].min(), cube["Last Date"].max()
+
+
+def financial_kpis(cube):
+    revenue = cube["Revenue (R) sum"].sum()
+    return {
+        "total_revenue": revenue,
+        "total_cost": cube["Total Cost (R) sum"].sum(),
+        "avg_cost_per_km": _mean(cube, "Cost per km (R/km)"),
+        "profit_margin": cube["Profit (R) sum"].sum() / revenue if revenue > 0 else 0
+    }
+
+
+def operations_kpis(cube):
+    active_trucks = cube.loc[cube["Trips"] > 0, "TruckID"].nunique()
+    total_tons = cube.loc[cube["Doc Type"] == OFFLOADING, "Ton Reg sum"].sum()
+    return {
+        "active_trucks": active_trucks,
+        "total_tons": total_tons,
+        "total_km": cube["Route Distance (km) sum"].sum(),
+        "avg_tons_per_truck": total_tons / active_trucks if active_trucks > 0 else 0
+    }
+
+
+def truck_costs(cube):
+    """Per-truck revenue, cost and profit totals (the Financials bar charts)."""
+    columns = ["Revenue (R)", "Variable Cost (R)", "Daily Fixed Cost (R/day)", "Total Cost (R)", "Profit (R)"]
+    grouped = cube.groupby("TruckID", observed=True)[[f"{c} sum" for c in columns]].sum()
+    grouped.columns = columns
+    return grouped.reset_index()
+
+
+def route_profit(cube):
+    """Per-route average revenue, cost and profit per row plus total tons."""
+    grouped = cube.groupby("Route Code", observed=True)
+    result = pd.DataFrame({
+        col: grouped[f"{col} sum"].sum() / grouped[f"{col} count"].sum().replace(0, np.nan)
+        for col in ["Revenue (R)", "Total Cost (R)", "Profit (R)"]
+    })
+    result["Ton Reg"] = grouped["Ton Reg sum"].sum()
+    return result.reset_index()
+
+
+def tons_per_truck(cube):
+    return cube.groupby(["TruckID", "Driver Name"], observed=True)["Ton Reg sum"].sum().reset_index(name="Ton Reg")
+
+
+def trips_per_truck(cube):
+    offloading = cube[cube["Doc Type"] == OFFLOADING]
+    return offloading.groupby(["TruckID", "Driver Name"], observed=True)["Trips"].sum().reset_index(name="Trips")
@@ -0,0 +1,44 @@
+"""
+Process-wide cache of serialized Plotly figures.
+
+Figures are stored as JSON keyed on (tab, chart id, month, truck, route,
+data version, ...), so reruns that do not change what a chart shows skip
+both the data work and the Plotly figure construction behind it.
+"""
+
+import threading
+from collections import OrderedDict
+
+import plotly.io as pio
+
+DEFAULT_MAX_FIGURES = 256
+
+
+class FigureCache:
+    def __init__(self, max_figures=DEFAULT_MAX_FIGURES):
+        self.max_figures = max_figures
+        self._specs = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_build(self, key, build):
+        """Return the figure JSON for ``key``, calling ``build()`` for a Figure on a miss."""
+        with self._lock:
+            if key in self._specs:
+                self._specs.move_to_end(key)
+                self.hits += 1
+                return self._specs[key]
+            self.misses += 1
+
+        spec = pio.to_json(build(), validate=False)
+
+        with self._lock:
+            self._specs[key] = spec
+            while len(self._specs) > self.max_figures:
+                self._specs.popitem(last=False)
+        return spec
+
+    def clear(self):
+        with self._lock:
+            self._specs.clear()
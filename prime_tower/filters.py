@@ -0,0 +1,56 @@
+"""
+Prebuilt filter index over (Year-Month, TruckID, Route Code).
+
+Every widget interaction reruns the dashboard script, so instead of
+scanning the whole frame with boolean masks the index keeps the row
+positions of every month, month × truck, month × route and
+month × truck × route partition. A lookup then costs the size of the
+result. Slices are not memoized here: the dashboard keeps them in the
+process-wide ``SharedStore``, shared across sessions.
+"""
+
+import numpy as np
+
+ALL = "All"
+
+MONTH_KEY = "Year-Month"
+TRUCK_KEY = "TruckID"
+ROUTE_KEY = "Route Code"
+
+
+def _partitions(df, keys):
+    if df.empty or not all(k in df.columns for k in keys):
+        return {}
+    # Normalise scalar keys so single- and multi-key lookups both use tuples
+    groups = df.groupby(keys if len(keys) > 1 else keys[0], sort=False, observed=True).indices
+    if len(keys) == 1:
+        return {(k,): v for k, v in groups.items()}
+    return groups
+
+
+class FilterIndex:
+    """
+    Row-position index for one frame; ``apply`` returns a new slice on
+    every call.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._partitions = {
+            (False, False): _partitions(df, [MONTH_KEY]),
+            (True, False): _partitions(df, [MONTH_KEY, TRUCK_KEY]),
+            (False, True): _partitions(df, [MONTH_KEY, ROUTE_KEY]),
+            (True, True): _partitions(df, [MONTH_KEY, TRUCK_KEY, ROUTE_KEY])
+        }
+
+    def positions(self, month, truck=ALL, route=ALL):
+        """Row positions for one month, or for a tuple of months in row order."""
+        if isinstance(month, tuple):
+            parts = [self.positions(m, truck, route) for m in month]
+            return np.sort(np.concatenate(parts)) if len(parts) > 1 else parts[0]
+        by_truck, by_route = truck != ALL, route != ALL
+        key = (month,) + ((truck,) if by_truck else ()) + ((route,) if by_route else ())
+        return self._partitions[(by_truck, by_route)].get(key, np.empty(0, dtype=np.intp))
+
+    def apply(self, month, truck=ALL, route=ALL):
+        return self.df.iloc[self.positions(month, truck, route)]
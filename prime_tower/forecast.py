@@ -0,0 +1,231 @@
+"""
+Daily tonnage forecasts per route and per truck.
+
+Each series is the daily offloaded ``Ton Reg`` of one route or truck (the
+series behind "Daily Tons Moved"), on one calendar shared by all series
+with zero-tonnage days filled in. Each is fit with damped-trend
+Holt-Winters and weekly seasonality; series too short for that get their
+recent daily mean.
+
+Fitting is spread over a process pool and the results are carried over
+between data versions:
+
+- a series whose values did not change keeps its model as is;
+- a series that only gained days re-runs the previous model's smoothing
+  through the new days (parameters and initial states fixed, a single
+  filter pass instead of an optimization);
+- parameters are re-estimated once a series has gained
+  ``REOPTIMIZE_DAYS`` since they were last estimated, or when its history
+  changed.
+"""
+
+import hashlib
+import logging
+import multiprocessing
+import os
+import time
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+from prime_tower import config
+from prime_tower.cube import OFFLOADING
+
+logger = logging.getLogger(__name__)
+
+HORIZON_DAYS = 28
+SEASONAL_PERIOD = 7
+# Three full seasons, deliberately: statsmodels can initialize from two, but the damped
+# seasonal model has 13 parameters, so 14 days would fit them almost exactly. Shorter
+# series get the recent mean
+MIN_MODEL_DAYS = 3 * SEASONAL_PERIOD
+MEAN_WINDOW_DAYS = 28
+REOPTIMIZE_DAYS = 28
+# Fewer series to estimate than this are fit in-process; a pool costs more to start
+MIN_PARALLEL_SERIES = 16
+# Two-sided band of +-Z residual standard deviations (about 80%)
+INTERVAL_Z = 1.28
+
+ENTITIES = {"routes": "Route Code", "trucks": "TruckID"}
+
+SMOOTHING_PARAMS = ("smoothing_level", "smoothing_trend", "smoothing_seasonal", "damping_trend")
+
+
+def daily_tons(operations, key):
+    """Daily offloaded tons, one column per ``key`` value, over the operations' full date range."""
+    offloaded = operations[operations["Doc Type"] == OFFLOADING]
+    if offloaded.empty:
+        return pd.DataFrame()
+    tons = pd.to_numeric(offloaded["Ton Reg"], errors="coerce").fillna(0).astype("float64")
+    series = (
+        tons.groupby([offloaded["Date_only"], offloaded[key]], observed=True).sum()
+        .unstack(fill_value=0.0)
+    )
+    days = pd.date_range(operations["Date_only"].min(), operations["Date_only"].max(), freq="D")
+    series = series.reindex(days, fill_value=0.0)
+    series.columns = series.columns.astype(str)
+    return series
+
+
+def _digest(values):
+    return hashlib.blake2b(np.ascontiguousarray(values, dtype="float64").tobytes(), digest_size=16).hexdigest()
+
+
+def _holt_winters(values, state=None):
+    options = {"trend": "add", "damped_trend": True, "seasonal": "add", "seasonal_periods": SEASONAL_PERIOD}
+    with warnings.catch_warnings():
+        # Flat or sparse series trip convergence warnings; the fit is still usable
+        warnings.simplefilter("ignore")
+        if state is None:
+            fit = ExponentialSmoothing(values, initialization_method="estimated", **options).fit()
+        else:
+            fit = ExponentialSmoothing(
+                values, initialization_method="known", initial_level=state["initial_level"],
+                initial_trend=state["initial_trend"], initial_seasonal=np.asarray(state["initial_seasons"]), **options
+            ).fit(optimized=False, **{name: state[name] for name in SMOOTHING_PARAMS})
+    params = fit.params
+    state = {name: float(params[name]) for name in SMOOTHING_PARAMS + ("initial_level", "initial_trend")}
+    state["initial_seasons"] = np.asarray(params["initial_seasons"], dtype="float64").tolist()
+    return fit.forecast(HORIZON_DAYS), values - fit.fittedvalues, state
+
+
+def fit_series(values, state=None):
+    """
+    Fit one series; ``state`` re-runs a previous fit's parameters instead
+    of estimating them. Returns a dict with the forecast, residual spread
+    and the state to reuse.
+    """
+    values = np.asarray(values, dtype="float64")
+    if len(values) < MIN_MODEL_DAYS or not values.any():
+        recent = values[-MEAN_WINDOW_DAYS:]
+        mean = recent.mean() if len(recent) else 0.0
+        return {"method": "mean", "forecast": np.full(HORIZON_DAYS, mean), "sigma": float(recent.std()) if len(recent) else 0.0,
+                "state": None}
+    forecast, residuals, state = _holt_winters(values, state)
+    return {"method": "holt_winters", "forecast": np.clip(forecast, 0, None), "sigma": float(np.std(residuals)),
+            "state": state}
+
+
+def _fit_task(task):
+    # Runs in a worker process; only arrays and plain dicts cross the boundary
+    entity, series_id, values, state = task
+    return (entity, series_id), fit_series(values, state)
+
+
+def _plan(entity, frame, previous):
+    """Split series into reused models and fit tasks (entity, series id, values, state or None)."""
+    reused, tasks = {}, []
+    for series_id in frame.columns:
+        values = frame[series_id].to_numpy()
+        digest = _digest(values)
+        old = previous.get(series_id) if previous else None
+        if old is not None and old["digest"] == digest and old["days"] == len(values):
+            reused[series_id] = old
+            continue
+        incremental = (
+            old is not None and old["state"] is not None and len(values) > old["days"]
+            and _digest(values[:old["days"]]) == old["digest"]
+            and len(values) - old["estimated_days"] < REOPTIMIZE_DAYS
+        )
+        tasks.append((entity, series_id, values, old["state"] if incremental else None))
+    return reused, tasks
+
+
+def _run_tasks(tasks, workers):
+    # Re-running known parameters is a few milliseconds; only estimation is worth a worker process
+    estimate = [task for task in tasks if task[3] is None]
+    fitted = dict(map(_fit_task, [task for task in tasks if task[3] is not None]))
+    if workers > 1 and len(estimate) >= MIN_PARALLEL_SERIES:
+        # Spawned workers: the dashboard process holds threads and locks a fork would copy
+        context = multiprocessing.get_context("spawn")
+        chunksize = max(1, len(estimate) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=min(workers, len(estimate)), mp_context=context) as pool:
+            fitted.update(pool.map(_fit_task, estimate, chunksize=chunksize))
+    else:
+        fitted.update(map(_fit_task, estimate))
+    return fitted
+
+
+class TonnageForecasts:
+    """
+    Fitted forecasts for every route and truck of one data version.
+
+    ``models[entity][series_id]`` holds each series' forecast, residual
+    spread, fit state and the fingerprint of the data it was fit on.
+    """
+
+    def __init__(self, start, days, models, stats):
+        self.start = start
+        self.days = days
+        self.models = models
+        self.stats = stats
+
+    @property
+    def dates(self):
+        return pd.date_range(self.start + pd.Timedelta(days=self.days), periods=HORIZON_DAYS, freq="D")
+
+    def forecast(self, entity, series_ids=None):
+        """
+        Daily forecast summed over ``series_ids`` (default: every series of
+        the entity), with an approximate band; variances are added as if
+        the series were independent.
+        """
+        models = self.models.get(entity, {})
+        chosen = [models[s] for s in (models if series_ids is None else series_ids) if s in models]
+        if not chosen:
+            return pd.DataFrame(columns=["Date", "Forecast", "Lower", "Upper"])
+        total = np.sum([m["forecast"] for m in chosen], axis=0)
+        spread = INTERVAL_Z * np.sqrt(np.sum([m["sigma"] ** 2 for m in chosen]))
+        return pd.DataFrame({
+            "Date": self.dates, "Forecast": total,
+            "Lower": np.clip(total - spread, 0, None), "Upper": total + spread
+        })
+
+    def frame(self, entity):
+        """Long table of every series' forecast for one entity."""
+        key = ENTITIES[entity]
+        rows = [
+            pd.DataFrame({key: series_id, "Date": self.dates, "Forecast": model["forecast"], "Model": model["method"]})
+            for series_id, model in self.models.get(entity, {}).items()
+        ]
+        return pd.concat(rows, ignore_index=True) if rows else pd.DataFrame(columns=[key, "Date", "Forecast", "Model"])
+
+
+def fit_forecasts(operations, previous=None, workers=None):
+    """
+    Fit or carry over a model for every route and truck series. Pass the
+    previous data version's ``TonnageForecasts`` as ``previous`` to refit
+    only what changed.
+    """
+    workers = (config.FORECAST_WORKERS or os.cpu_count() or 1) if workers is None else workers
+    start = time.perf_counter()
+    models, tasks, stats = {}, [], {"reused": 0, "incremental": 0, "estimated": 0}
+    first = days = None
+    for entity, key in ENTITIES.items():
+        frame = daily_tons(operations, key) if key in operations.columns else pd.DataFrame()
+        if frame.empty:
+            models[entity] = {}
+            continue
+        first, days = frame.index[0], len(frame)
+        old = previous.models.get(entity) if previous is not None and previous.start == first else None
+        models[entity], entity_tasks = _plan(entity, frame, old)
+        stats["reused"] += len(models[entity])
+        tasks += entity_tasks
+
+    # Routes and trucks share one pool
+    fitted = _run_tasks(tasks, workers)
+    for entity, series_id, values, state in tasks:
+        estimated = len(values) if state is None else previous.models[entity][series_id]["estimated_days"]
+        models[entity][series_id] = dict(
+            fitted[entity, series_id], digest=_digest(values), days=len(values), estimated_days=estimated
+        )
+        stats["incremental" if state is not None else "estimated"] += 1
+
+    stats["seconds"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Tonnage forecasts: {stats}")
+    if first is None:
+        return TonnageForecasts(pd.Timestamp.today().normalize(), 0, models, stats)
+    return TonnageForecasts(first, days, models, stats)
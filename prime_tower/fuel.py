@@ -0,0 +1,116 @@
+"""
+Fill-to-fill fuel ledger.
+
+Fuel-type operations rows are fuel slips (``Ton Reg`` holds litres). The
+ledger rolls them up per truck and day, orders them per truck and reads
+each fill's odometer from the cumulative tracker distance, so the
+distance driven between two fills and the litres that refilled it give
+the truck's real km/L. Everything is one sort, one as-of join and one
+grouped shift over the whole fleet history.
+
+Trucks without tracker data fall back to the route distance of the fill,
+which is what the Fuel tab used before.
+"""
+
+import numpy as np
+import pandas as pd
+
+from prime_tower.model import lookup_table
+
+FUEL_DOC_TYPE = "Fuel"
+
+TRACKER = "tracker"
+ROUTE = "route"
+
+
+def _odometer(tracker):
+    """Cumulative tracker distance per truck at the end of each day."""
+    if tracker.empty or not {"TruckID", "Date", "Distance (km)"} <= set(tracker.columns):
+        return pd.DataFrame({
+            "_truck": pd.Series(dtype=str),
+            "Date_only": pd.Series(dtype="datetime64[ns]"),
+            "Odometer (km)": pd.Series(dtype="float64")
+        })
+    daily = (
+        tracker.assign(**{
+            "_truck": tracker["TruckID"].astype(str),
+            "Date_only": pd.to_datetime(tracker["Date"], errors="coerce").dt.normalize().astype("datetime64[ns]"),
+            "Distance (km)": pd.to_numeric(tracker["Distance (km)"], errors="coerce").fillna(0).astype("float64")
+        })
+        .dropna(subset=["Date_only"])
+        .groupby(["_truck", "Date_only"], sort=True)["Distance (km)"].sum()
+        .reset_index()
+    )
+    daily["Odometer (km)"] = daily.groupby("_truck", sort=False)["Distance (km)"].cumsum()
+    return daily.drop(columns="Distance (km)")
+
+
+def build_fuel_ledger(operations, tracker, truck_pak, loi):
+    """
+    One row per truck per fill day: litres, odometer, distance since the
+    previous fill and fill-to-fill km/L (NaN for a truck's first fill).
+
+    ``operations`` must be prepared (``Date_only`` and ``Year-Month`` set).
+    """
+    fills = operations[operations["Doc Type"] == FUEL_DOC_TYPE]
+    fills = (
+        fills.assign(Litres=pd.to_numeric(fills["Ton Reg"], errors="coerce").fillna(0).astype("float64"))
+        .groupby(["TruckID", "Date_only"], observed=True, sort=False)
+        .agg(**{
+            "Litres": ("Litres", "sum"),
+            "Route Code": ("Route Code", "last"),
+            "Year-Month": ("Year-Month", "first"),
+            "Date": ("Date", "max")
+        })
+        .reset_index()
+    )
+    fills["_truck"] = fills["TruckID"].astype(str)
+    # merge_asof needs the same datetime resolution on both sides
+    fills["Date_only"] = fills["Date_only"].astype("datetime64[ns]")
+
+    # Odometer at each fill: the tracker total at the end of that day (or the last tracked day before it)
+    ledger = pd.merge_asof(
+        fills.sort_values("Date_only"), _odometer(tracker).sort_values("Date_only"),
+        on="Date_only", by="_truck", direction="backward"
+    ).sort_values(["_truck", "Date_only"], kind="stable")
+
+    tracked = ledger["Odometer (km)"].notna()
+    previous = ledger.groupby("_truck", sort=False)["Odometer (km)"].shift()
+    distance = ledger["Odometer (km)"] - previous
+
+    if "Distance (km)" in loi.columns:
+        route_km = ledger[["Route Code"]].merge(
+            lookup_table(loi, "Route Code", ["Distance (km)"], "loi"), on="Route Code", how="left", validate="many_to_one"
+        )["Distance (km)"]
+        route_km = pd.to_numeric(route_km, errors="coerce").astype("float64").to_numpy()
+    else:
+        route_km = np.full(len(ledger), np.nan)
+
+    ledger["Distance (km)"] = np.where(tracked, distance, route_km)
+    ledger["Distance Source"] = np.where(tracked, TRACKER, ROUTE)
+    valid = (ledger["Distance (km)"] > 0) & (ledger["Litres"] > 0)
+    ledger["Fuel Efficiency (km/L)"] = (ledger["Distance (km)"] / ledger["Litres"]).where(valid)
+
+    ledger = ledger.merge(lookup_table(truck_pak, "TruckID", ["Driver Name"], "truck_pak"),
+                          on="TruckID", how="left", validate="many_to_one")
+    return ledger.drop(columns="_truck").reset_index(drop=True)
+
+
+def efficiency(ledger, by):
+    """Distance-weighted km/L per ``by`` group over fills with a measured distance."""
+    measured = ledger[ledger["Fuel Efficiency (km/L)"].notna()]
+    totals = measured.groupby(list(by), observed=True)[["Distance (km)", "Litres"]].sum()
+    totals["Fuel Efficiency (km/L)"] = totals["Distance (km)"] / totals["Litres"]
+    return totals.reset_index()
+
+
+def fleet_kpis(ledger):
+    measured = ledger[ledger["Fuel Efficiency (km/L)"].notna()]
+    distance, litres = measured["Distance (km)"].sum(), measured["Litres"].sum()
+    per_truck = efficiency(ledger, ["TruckID"])["Fuel Efficiency (km/L)"]
+    return {
+        "avg_efficiency": distance / litres if litres > 0 else np.nan,
+        "total_fuel": ledger["Litres"].sum(),
+        "litres_per_km": litres / distance if distance > 0 else np.nan,
+        "best_truck_efficiency": per_truck.max() if not per_truck.empty else np.nan
+    }
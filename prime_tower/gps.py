@@ -0,0 +1,233 @@
+"""
+Raw GPS ping ingestion into per-truck, per-day distance.
+
+Telematics exports run to millions of pings a month, so they are read in
+chunks (CSV or Parquet) and never held whole. Each chunk is sorted by
+truck and time, the leg between consecutive pings of a truck is measured
+with a vectorized haversine over the coordinate arrays, and legs are
+summed per truck and day. The last ping of every truck is carried into
+the next chunk (and the next file), so legs across chunk boundaries are
+counted too; exports are expected in time order, as telematics platforms
+write them.
+
+The rollup is kept as an uncompressed Arrow IPC file that is read back
+through a memory map. It has the tracker sheet's columns (``Date``,
+``TruckID``, ``Distance (km)``), so when it exists the loader uses it in
+place of the tracker worksheet. Ingesting is additive: a small state
+file next to it records the exports already ingested (skipped if given
+again) and each truck's last ping, so the next export continues the legs.
+
+Usage::
+
+    python -m prime_tower.gps exports/pings_2024-01.csv exports/pings_2024-02.parquet
+"""
+
+import argparse
+import json
+import logging
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from prime_tower import config
+
+logger = logging.getLogger(__name__)
+
+EARTH_RADIUS_KM = 6371.0088
+CHUNK_ROWS = 1_000_000
+# Legs implying a faster speed are position glitches and are dropped
+MAX_SPEED_KMH = 160
+
+# Export column -> role
+PING_COLUMNS = {"truck": "TruckID", "time": "Timestamp", "lat": "Latitude", "lon": "Longitude"}
+
+DAILY_COLUMNS = ["Date", "TruckID", "Distance (km)", "Pings"]
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between coordinate arrays (degrees)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(a, dtype=np.float64)) for a in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def _chunks(path, columns, chunksize):
+    names = list(columns.values())
+    if path.endswith(".parquet"):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize, columns=names):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, usecols=names, chunksize=chunksize)
+
+
+def _normalize(chunk, columns):
+    pings = pd.DataFrame({
+        "truck": chunk[columns["truck"]].astype(str).str.strip(),
+        "time": pd.to_datetime(chunk[columns["time"]], errors="coerce", format="mixed").astype("datetime64[ns]"),
+        "lat": pd.to_numeric(chunk[columns["lat"]], errors="coerce").astype("float64"),
+        "lon": pd.to_numeric(chunk[columns["lon"]], errors="coerce").astype("float64")
+    })
+    return pings.dropna()
+
+
+def rollup_chunk(pings, carry=None):
+    """
+    Per-truck, per-day distance for one normalized chunk.
+
+    ``carry`` holds the previous chunk's last ping per truck. Returns
+    ``(daily, carry)`` with the carry for the next chunk.
+    """
+    fresh = np.ones(len(pings), dtype=bool)
+    if carry is not None and not carry.empty:
+        pings = pd.concat([carry, pings], ignore_index=True)
+        fresh = np.concatenate([np.zeros(len(carry), dtype=bool), fresh])
+    order = np.lexsort((pings["time"].to_numpy(), pings["truck"].to_numpy()))
+    truck = pings["truck"].to_numpy()[order]
+    stamp = pings["time"].to_numpy()[order]
+    lat, lon = pings["lat"].to_numpy()[order], pings["lon"].to_numpy()[order]
+    fresh = fresh[order]
+
+    # Leg i ends at ping i + 1; it counts when both pings belong to the same truck
+    km = haversine_km(lat[:-1], lon[:-1], lat[1:], lon[1:])
+    hours = (stamp[1:] - stamp[:-1]) / np.timedelta64(1, "h")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plausible = (hours <= 0) & (km == 0) | (km / hours <= MAX_SPEED_KMH)
+    valid = (truck[1:] == truck[:-1]) & plausible
+    distance = np.concatenate([[0.0], np.where(valid, km, 0.0)])
+
+    frame = pd.DataFrame({
+        "TruckID": truck,
+        "Date": stamp.astype("datetime64[D]").astype("datetime64[ns]"),
+        "Distance (km)": distance,
+        "Pings": fresh.astype(np.int64)
+    })
+    daily = frame.groupby(["TruckID", "Date"], sort=False).sum().reset_index()
+
+    last = np.append(truck[1:] != truck[:-1], True)
+    carry = pd.DataFrame({"truck": truck[last], "time": stamp[last], "lat": lat[last], "lon": lon[last]})
+    return daily, carry
+
+
+def rollup_files(paths, columns=PING_COLUMNS, chunksize=CHUNK_ROWS, carry=None):
+    """
+    Per-truck, per-day distance over ``paths`` in order, one chunk in memory
+    at a time. Returns ``(daily, carry)``.
+    """
+    partials, rows = [], 0
+    for path in paths:
+        for chunk in _chunks(path, columns, chunksize):
+            pings = _normalize(chunk, columns)
+            rows += len(chunk)
+            if pings.empty:
+                continue
+            daily, carry = rollup_chunk(pings, carry)
+            partials.append(daily)
+    logger.info(f"Rolled up {rows:,} pings from {len(paths)} file(s)")
+    if not partials:
+        return pd.DataFrame(columns=DAILY_COLUMNS), carry
+    return _combine(partials), carry
+
+
+def _combine(partials):
+    # A truck-day split across chunks or exports has one partial row per piece
+    daily = pd.concat(partials, ignore_index=True).groupby(["TruckID", "Date"], sort=True).sum().reset_index()
+    return daily[DAILY_COLUMNS]
+
+
+def write_daily(daily, path=None):
+    """Store the rollup as an uncompressed Arrow IPC file so readers can memory-map it."""
+    path = path or config.GPS_STORE
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    frame = daily[DAILY_COLUMNS].assign(TruckID=daily["TruckID"].astype("category"))
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    with pa.OSFile(path + ".tmp", "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(path + ".tmp", path)
+    return path
+
+
+def read_daily(path=None):
+    path = path or config.GPS_STORE
+    with pa.memory_map(path, "r") as source:
+        return pa.ipc.open_file(source).read_all().to_pandas()
+
+
+def has_daily(path=None):
+    return os.path.exists(path or config.GPS_STORE)
+
+
+def _state_path(path):
+    return path + ".state.json"
+
+
+def _read_state(path):
+    try:
+        with open(_state_path(path)) as fh:
+            state = json.load(fh)
+    except (OSError, ValueError):
+        return {"files": [], "carry": None}
+    carry = pd.DataFrame(state["carry"]) if state.get("carry") else None
+    if carry is not None:
+        carry["time"] = pd.to_datetime(carry["time"]).astype("datetime64[ns]")
+    return {"files": state.get("files", []), "carry": carry}
+
+
+def _write_state(path, files, carry):
+    carry = None if carry is None else carry.assign(time=carry["time"].astype(str)).to_dict(orient="list")
+    with open(_state_path(path) + ".tmp", "w") as fh:
+        json.dump({"files": files, "carry": carry}, fh)
+    os.replace(_state_path(path) + ".tmp", _state_path(path))
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def ingest(paths, path=None, columns=PING_COLUMNS, chunksize=CHUNK_ROWS):
+    """
+    Roll up new ping exports and add them to the stored rollup.
+
+    Exports already ingested (same path, size and modified time) are
+    skipped, so re-running over a directory does not double count.
+    """
+    path = path or config.GPS_STORE
+    state = _read_state(path) if has_daily(path) else {"files": [], "carry": None}
+    new = [p for p in paths if _file_key(p) not in state["files"]]
+    if len(new) < len(paths):
+        logger.info(f"Skipping {len(paths) - len(new)} already ingested export(s)")
+    if not new:
+        return read_daily(path)
+
+    daily, carry = rollup_files(new, columns, chunksize, state["carry"])
+    if has_daily(path):
+        stored = read_daily(path)
+        daily = _combine([stored.assign(TruckID=stored["TruckID"].astype(str)), daily])
+    write_daily(daily, path)
+    _write_state(path, state["files"] + [_file_key(p) for p in new], carry)
+    return daily
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Roll raw GPS pings up into per-truck daily distance.")
+    parser.add_argument("paths", nargs="+", help="ping exports (.csv, .csv.gz or .parquet) in time order")
+    parser.add_argument("--store", help=f"rollup file (default: {config.GPS_STORE})")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_ROWS)
+    for role, column in PING_COLUMNS.items():
+        parser.add_argument(f"--{role}-column", default=column)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    columns = {role: getattr(args, f"{role}_column") for role in PING_COLUMNS}
+    start = time.perf_counter()
+    daily = ingest(args.paths, args.store, columns, args.chunksize)
+    print(f"{args.store or config.GPS_STORE}: {len(daily):,} truck-days, "
+          f"{daily['Distance (km)'].sum():,.0f} km in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Entry point for loading the five PrimeTower source tables.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from prime_tower import config, gps, sheets, sync
+
+logger = logging.getLogger(__name__)
+
+TRACKER_SHEET = "tracker"
+
+
+def load_source_tables(creds_info, key=sheets.SPREADSHEET_KEY, incremental=None, store_dir=None):
+    """
+    Open the workbook once and return ``(tables, timings)``.
+
+    ``tables`` holds operations, tracker, loi, truck_pak and vcs in
+    dashboard order. With ``incremental`` the operations sheet is synced
+    append-only against the local store while the other four sheets are
+    fetched in parallel. When a GPS rollup exists (see ``prime_tower.gps``)
+    it stands in for the tracker sheet, which is then not fetched.
+    """
+    incremental = config.INCREMENTAL_SYNC if incremental is None else incremental
+    spreadsheet = sheets.open_spreadsheet(sheets.build_client(creds_info), key)
+    frames, timings = {}, {}
+    if gps.has_daily():
+        start = time.perf_counter()
+        frames[TRACKER_SHEET] = gps.read_daily()[["Date", "TruckID", "Distance (km)"]]
+        timings["gps rollup"] = time.perf_counter() - start
+    pending = [name for name in sheets.SOURCE_SHEETS if name not in frames]
+
+    if not incremental:
+        fetched, fetch_timings = sheets.fetch_worksheets(spreadsheet, pending)
+        frames.update(fetched)
+        timings.update(fetch_timings)
+        return tuple(frames[name] for name in sheets.SOURCE_SHEETS), timings
+
+    others = [name for name in pending if name != sync.OPERATIONS_SHEET]
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        ops_future = pool.submit(_timed_sync, spreadsheet, store_dir)
+        fetched, fetch_timings = sheets.fetch_worksheets(spreadsheet, others)
+        frames.update(fetched)
+        timings.update(fetch_timings)
+        try:
+            frames[sync.OPERATIONS_SHEET], timings[sync.OPERATIONS_SHEET] = ops_future.result()
+        except Exception as e:
+            logger.error(f"Incremental operations sync failed, loading in full: {str(e)}")
+            full, full_timings = sheets.fetch_worksheets(spreadsheet, [sync.OPERATIONS_SHEET])
+            frames.update(full)
+            timings.update(full_timings)
+    return tuple(frames[name] for name in sheets.SOURCE_SHEETS), timings
+
+
+def _timed_sync(spreadsheet, store_dir):
+    start = time.perf_counter()
+    df = sync.sync_operations(spreadsheet, store_dir)
+    return df, time.perf_counter() - start
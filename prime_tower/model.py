@@ -0,0 +1,124 @@
+"""
+Data-model stage: typed, enriched tables derived once per data load.
+"""
+
+import logging
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+VARIABLE_COST_COLUMNS = ["Fuel Cost (R/km)", "Maintenance Cost (R/km)", "Tyres (R/km)"]
+FIXED_COST_COLUMN = "Daily Fixed Cost (R/day)"
+
+TRACKER_DATE_COLUMN = "Date"
+
+
+def _to_numeric(df, columns):
+    # Sheet columns can arrive as object or integer; money arithmetic is done in float64
+    for col in columns:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+    return df
+
+
+def prepare_operations(operations):
+    """
+    Parse and type the operations table once per data load.
+
+    Dates are parsed a single time; Year-Month ("2024-05") and
+    Month_Display ("May 2024") are categoricals whose labels are formatted
+    from the unique months only. Returns ``(operations, month_dict)`` where
+    ``month_dict`` maps display labels to Year-Month in chronological order.
+    """
+    ops = operations.copy()
+    if "Date" not in ops.columns:
+        return ops, {}
+
+    ops["Date"] = pd.to_datetime(ops["Date"], errors="coerce")
+    ops["Date_only"] = ops["Date"].dt.normalize()
+
+    periods = ops["Date"].dt.to_period("M")
+    months = pd.PeriodIndex(periods.dropna().unique()).sort_values()
+    codes = months.get_indexer(periods)
+    year_month = months.strftime("%Y-%m")
+    month_display = months.strftime("%B %Y")
+    ops["Year-Month"] = pd.Categorical.from_codes(codes, categories=year_month, ordered=True)
+    ops["Month_Display"] = pd.Categorical.from_codes(codes, categories=month_display, ordered=True)
+
+    month_dict = dict(zip(month_display, year_month))
+    return ops, month_dict
+
+
+def lookup_table(df, key, columns, name):
+    """Reduce a lookup table to one row per key so joins against it stay many-to-one."""
+    table = df[[key] + columns]
+    duplicated = table[key].duplicated(keep="last")
+    if duplicated.any():
+        logger.warning(f"{name} has {int(duplicated.sum())} duplicate {key} rows, keeping the last")
+        table = table[~duplicated]
+    return table
+
+
+def aggregate_tracker_distance(tracker):
+    """
+    Collapse tracker rows to one distance per truck per day.
+
+    Without a tracker date column the best available figure is the truck's
+    average distance per tracker row, keyed on TruckID alone.
+    """
+    distance = pd.to_numeric(tracker["Distance (km)"], errors="coerce")
+    if TRACKER_DATE_COLUMN in tracker.columns:
+        day = pd.to_datetime(tracker[TRACKER_DATE_COLUMN], errors="coerce", format="mixed").dt.normalize()
+        daily = (
+            pd.DataFrame({"TruckID": tracker["TruckID"], "Day": day, "Distance (km)": distance})
+            .dropna(subset=["Day"])
+            .groupby(["TruckID", "Day"], as_index=False, observed=True)["Distance (km)"].sum()
+        )
+        return daily, ["TruckID", "Day"]
+    per_truck = (
+        pd.DataFrame({"TruckID": tracker["TruckID"], "Distance (km)": distance})
+        .groupby("TruckID", as_index=False, observed=True)["Distance (km)"].mean()
+    )
+    return per_truck, ["TruckID"]
+
+
+def _join_tracker_distance(facts, tracker):
+    distance, keys = aggregate_tracker_distance(tracker)
+    if "Day" in keys:
+        facts["Day"] = pd.to_datetime(facts["Date"], errors="coerce").dt.normalize()
+    facts = facts.merge(distance, on=keys, how="left", validate="many_to_one")
+    if "Day" in keys:
+        # A truck-day's distance is shared by all of that truck's rows on the day
+        rows_per_day = facts.groupby(["TruckID", "Day"], observed=True)["TruckID"].transform("size")
+        facts["Distance (km)"] = facts["Distance (km)"] / rows_per_day
+        facts = facts.drop(columns="Day")
+    return facts
+
+
+def build_trip_facts(operations, tracker, loi, truck_pak, vcs):
+    """
+    Enriched trips fact table behind the Financials and Alerts tabs.
+
+    One row per operations row, joined to its route rate, driver, tracker
+    distance (aggregated per truck and day, see ``aggregate_tracker_distance``)
+    and cost schedule, with Revenue, Variable Cost, Total Cost and Profit
+    precomputed. Filter it with ``apply_filters`` rather than re-merging.
+    """
+    facts = operations.copy()
+    facts["Ton Reg"] = pd.to_numeric(facts["Ton Reg"], errors="coerce").astype("float64").fillna(0)
+
+    facts = facts.merge(lookup_table(loi, "Route Code", ["Rate per ton"], "loi"),
+                        on="Route Code", how="left", validate="many_to_one")
+    facts = facts.merge(lookup_table(truck_pak, "TruckID", ["Driver Name"], "truck_pak"),
+                        on="TruckID", how="left", validate="many_to_one")
+    facts = _join_tracker_distance(facts, tracker)
+    facts = facts.merge(lookup_table(vcs, "TruckID", VARIABLE_COST_COLUMNS + [FIXED_COST_COLUMN], "vcs"),
+                        on="TruckID", how="left", validate="many_to_one")
+    facts = _to_numeric(facts, ["Rate per ton", "Distance (km)"] + VARIABLE_COST_COLUMNS + [FIXED_COST_COLUMN])
+
+    facts["Revenue (R)"] = facts["Ton Reg"] * facts["Rate per ton"].fillna(0)
+    facts["Variable Cost (R)"] = facts["Distance (km)"] * facts[VARIABLE_COST_COLUMNS].fillna(0).sum(axis=1)
+    facts["Total Cost (R)"] = facts["Variable Cost (R)"] + facts[FIXED_COST_COLUMN].fillna(0)
+    facts["Profit (R)"] = facts["Revenue (R)"] - facts["Total Cost (R)"]
+    return facts
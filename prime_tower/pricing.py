@@ -0,0 +1,132 @@
+"""
+What-if pricing simulator over every route at once.
+
+Trip facts are reduced once to a per-route basis (tons carried, current
+rate, cost per cost component). A scenario is a candidate rate per route
+and a set of cost changes; revenue is linear in the rate and costs are
+linear in the component multipliers, so every scenario is a broadcast of
+the basis arrays:
+
+    revenue[route, rate]           = tons[route] * rates[route, rate]
+    cost[scenario, route]          = components[route, :] @ multipliers[scenario, :]
+    profit[scenario, route, rate]  = revenue[None] - cost[..., None]
+
+Thousands of scenarios over hundreds of routes are a few array
+operations, with no per-route or per-scenario Python loop.
+"""
+
+import numpy as np
+import pandas as pd
+
+from prime_tower.model import FIXED_COST_COLUMN, VARIABLE_COST_COLUMNS
+
+# Candidate rates as multiples of each route's current rate
+DEFAULT_MULTIPLIERS = np.round(np.arange(0.80, 1.505, 0.01), 2)
+
+# Cost component (vcs column) -> per-route cost column in the basis
+COMPONENTS = {column: column.replace(" (R/km)", " (R)") for column in VARIABLE_COST_COLUMNS}
+COMPONENTS[FIXED_COST_COLUMN] = "Fixed Cost (R)"
+
+# cost_scenarios keyword -> vcs column
+COST_KEYS = dict(zip(("fuel", "maintenance", "tyres", "fixed"), COMPONENTS))
+
+
+def route_basis(cost_df):
+    """
+    Per-route inputs of the simulator from trip facts (any filter).
+
+    Columns: ``Ton Reg``, ``Rate per ton`` (tonnage-weighted), one cost
+    column per component in ``COMPONENTS`` and ``Total Cost (R)``.
+    """
+    distance = cost_df["Distance (km)"].fillna(0)
+    parts = {"Ton Reg": cost_df["Ton Reg"], "Revenue (R)": cost_df["Revenue (R)"]}
+    for column, name in COMPONENTS.items():
+        parts[name] = cost_df[column].fillna(0) if column == FIXED_COST_COLUMN else distance * cost_df[column].fillna(0)
+    basis = (
+        pd.DataFrame(parts).assign(**{"Route Code": cost_df["Route Code"]})
+        .groupby("Route Code", observed=True).sum().astype("float64")
+    )
+    basis["Rate per ton"] = (basis["Revenue (R)"] / basis["Ton Reg"]).where(basis["Ton Reg"] > 0)
+    basis["Total Cost (R)"] = basis[list(COMPONENTS.values())].sum(axis=1)
+    return basis.drop(columns="Revenue (R)")
+
+
+def cost_scenarios(**changes):
+    """
+    Cartesian grid of cost scenarios from per-component changes, e.g.
+    ``cost_scenarios(fuel=[0, 0.1, 0.2])`` (fractions, keywords from
+    ``COST_KEYS``). Returns one row per scenario with a multiplier column
+    per component.
+    """
+    unknown = set(changes) - set(COST_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown cost components: {', '.join(sorted(unknown))}")
+    axes = [np.atleast_1d(np.asarray(changes.get(key, 0.0), dtype="float64")) for key in COST_KEYS]
+    grid = np.stack(np.meshgrid(*axes, indexing="ij"), axis=-1).reshape(-1, len(COST_KEYS))
+    return pd.DataFrame(1.0 + grid, columns=list(COMPONENTS))
+
+
+def simulate(basis, multipliers=DEFAULT_MULTIPLIERS, scenarios=None, rates=None):
+    """
+    Evaluate every (cost scenario, route, candidate rate) at once.
+
+    Candidate rates are ``multipliers`` times each route's current rate,
+    or ``rates`` (one shared row, or one row per route) when given.
+    ``scenarios`` is a ``cost_scenarios`` frame; default is no cost change.
+
+    Returns a dict: ``routes``, ``rates`` (route x rate), ``scenarios``,
+    the ``revenue`` (route x rate), ``profit`` and ``margin`` surfaces
+    (scenario x route x rate) and ``break_even`` (scenario x route), the
+    rate at which each route's revenue covers its cost.
+    """
+    scenarios = cost_scenarios() if scenarios is None else scenarios
+    tons = basis["Ton Reg"].to_numpy()
+    if rates is None:
+        rates = basis["Rate per ton"].to_numpy()[:, None] * np.asarray(multipliers, dtype="float64")[None, :]
+    else:
+        rates = np.broadcast_to(np.atleast_2d(np.asarray(rates, dtype="float64")), (len(basis), np.shape(rates)[-1]))
+
+    components = basis[list(COMPONENTS.values())].to_numpy()
+    cost = scenarios[list(COMPONENTS)].to_numpy() @ components.T
+    revenue = tons[:, None] * rates
+    profit = revenue[None, :, :] - cost[:, :, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = np.where(revenue > 0, profit / revenue, np.nan)
+        break_even = np.where(tons > 0, cost / tons, np.nan)
+    return {
+        "routes": basis.index,
+        "rates": rates,
+        "scenarios": scenarios,
+        "revenue": revenue,
+        "profit": profit,
+        "margin": margin,
+        "break_even": break_even
+    }
+
+
+def target_rate(basis, margin, scenarios=None):
+    """Rate per route (scenario x route) that earns ``margin`` of revenue as profit."""
+    scenarios = cost_scenarios() if scenarios is None else scenarios
+    cost = scenarios[list(COMPONENTS)].to_numpy() @ basis[list(COMPONENTS.values())].to_numpy().T
+    tons = basis["Ton Reg"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((tons > 0) & (margin < 1), cost / (tons * (1 - margin)), np.nan)
+
+
+def route_summary(basis, result, scenario=0, multiplier=1.0):
+    """One row per route for one scenario at the candidate rate nearest ``multiplier`` x current."""
+    rates = result["rates"]
+    current = basis["Rate per ton"].to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pick = np.argmin(np.abs(np.nan_to_num(rates / current[:, None], nan=np.inf) - multiplier), axis=1)
+    rows = np.arange(len(basis))
+    return pd.DataFrame({
+        "Route Code": result["routes"],
+        "Ton Reg": basis["Ton Reg"].to_numpy(),
+        "Rate per ton": current,
+        "Break-even Rate": result["break_even"][scenario],
+        "Scenario Rate": rates[rows, pick],
+        "Projected Revenue (R)": result["revenue"][rows, pick],
+        "Projected Profit (R)": result["profit"][scenario, rows, pick],
+        "Projected Margin": result["margin"][scenario, rows, pick]
+    })
@@ -0,0 +1,121 @@
+"""
+Per-rerun timing spans.
+
+Each dashboard rerun starts a ``RerunProfile`` for its thread; code on
+the hot path wraps stages in ``span(...)`` and cache layers ``annotate``
+the open span with hits and misses. Outside a rerun (background
+refreshes, the batch runner) every call here is a no-op.
+
+A finished profile is logged as one JSON line and can be shown in the
+admin sidebar panel.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+_local = threading.local()
+
+
+class RerunProfile:
+    def __init__(self, page=None):
+        self.page = page
+        self.started_at = time.time()
+        self._start = time.perf_counter()
+        self.spans = []
+        self._stack = []
+
+    @contextmanager
+    def span(self, stage, **detail):
+        entry = {"stage": stage, "depth": len(self._stack), "seconds": None, **detail}
+        self.spans.append(entry)
+        self._stack.append(entry)
+        start = time.perf_counter()
+        try:
+            yield entry
+        finally:
+            entry["seconds"] = time.perf_counter() - start
+            self._stack.pop()
+
+    def record(self, stage, seconds, **detail):
+        """Add an already measured stage (e.g. per-sheet fetch timings)."""
+        self.spans.append({"stage": stage, "depth": len(self._stack), "seconds": seconds, **detail})
+
+    def annotate(self, **detail):
+        if self._stack:
+            self._stack[-1].update(detail)
+
+    def note_cache(self, hit):
+        # A miss anywhere under a span wins over hits on other caches it touched
+        if self._stack:
+            if hit:
+                self._stack[-1].setdefault("cache", "hit")
+            else:
+                self._stack[-1]["cache"] = "miss"
+
+    def elapsed(self):
+        return time.perf_counter() - self._start
+
+    def as_frame(self):
+        frame = pd.DataFrame(self.spans, columns=["stage", "depth", "seconds", "cache"])
+        frame["stage"] = frame["depth"].map(lambda d: "· " * d) + frame["stage"]
+        return frame.drop(columns="depth")
+
+    def log(self):
+        logger.info(json.dumps({
+            "event": "rerun_profile",
+            "page": self.page,
+            "started_at": self.started_at,
+            "total_seconds": round(self.elapsed(), 4),
+            "spans": [{**entry, "seconds": round(entry["seconds"] or 0.0, 4)} for entry in self.spans]
+        }, default=str))
+
+
+def start_rerun(page=None):
+    """Begin profiling the current thread's rerun; replaces any previous profile."""
+    _local.profile = RerunProfile(page)
+    return _local.profile
+
+
+def current():
+    return getattr(_local, "profile", None)
+
+
+@contextmanager
+def span(stage, **detail):
+    profile = current()
+    if profile is None:
+        yield None
+        return
+    with profile.span(stage, **detail) as entry:
+        yield entry
+
+
+def record(stage, seconds, **detail):
+    profile = current()
+    if profile is not None:
+        profile.record(stage, seconds, **detail)
+
+
+def annotate(**detail):
+    profile = current()
+    if profile is not None:
+        profile.annotate(**detail)
+
+
+def cache_lookup():
+    profile = current()
+    if profile is not None:
+        profile.note_cache(hit=True)
+
+
+def cache_miss():
+    profile = current()
+    if profile is not None:
+        profile.note_cache(hit=False)
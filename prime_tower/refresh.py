@@ -0,0 +1,101 @@
+"""
+Background refresh scheduler driven by the workbook's modified time.
+
+Every ``interval`` seconds the scheduler asks Drive for the spreadsheet's
+``modifiedTime``, a single metadata call that reads no cell data. Only
+when it moves does it refresh the snapshot: operations are synced
+append-only (just the new tail) and the reference sheets come back in
+one batched read. The snapshot rewrites only the tables whose content
+changed, and the data version moves only then, which is what
+invalidates the downstream caches. A GPS rollup written since the last
+check counts as a change too, since it stands in for the tracker sheet.
+
+Sheets exposes no per-worksheet revision, so which sheets changed is
+decided by content fingerprint after that read.
+"""
+
+import logging
+import os
+import threading
+import time
+
+from prime_tower import config, gps, sheets
+
+logger = logging.getLogger(__name__)
+
+def source_modified_time(creds_info, key=sheets.SPREADSHEET_KEY):
+    """
+    Callable returning when the source tables last changed: the workbook's
+    modified time, or the GPS rollup's when that is newer (it stands in
+    for the tracker sheet). The workbook is opened on first use.
+    """
+    opened = []
+
+    def modified_time():
+        if not opened:
+            opened.append(sheets.open_spreadsheet(sheets.build_client(creds_info), key))
+        modified = sheets.modified_time(opened[0])
+        if gps.has_daily():
+            modified = max(modified, os.path.getmtime(config.GPS_STORE))
+        return modified
+
+    return modified_time
+
+
+class RefreshScheduler:
+    """
+    Poll ``modified_time()`` (epoch seconds) and call ``store.refresh()``
+    when the source changed after the snapshot was last checked.
+    """
+
+    def __init__(self, store, modified_time, interval=None):
+        self.store = store
+        self.modified_time = modified_time
+        self.interval = config.REFRESH_INTERVAL if interval is None else interval
+        self.last_modified = None
+        self.last_error = None
+        self.polls = 0
+        self.refreshes = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """Check once; returns True when a refresh ran."""
+        self.polls += 1
+        modified = self.modified_time()
+        if modified == self.last_modified:
+            return False
+        # A snapshot checked after the change (e.g. by the TTL refresh) already has it
+        if not self.store.changed_since_check(modified):
+            self.last_modified = modified
+            return False
+        logger.info(f"Spreadsheet modified {time.time() - modified:.0f}s ago, refreshing snapshot")
+        if self.store.refresh(blocking=False) is None:
+            # The TTL refresh is fetching; the next poll checks whether it caught this change
+            return False
+        # Recorded only after a successful refresh so a failed one is retried next poll
+        self.last_modified = modified
+        self.refreshes += 1
+        return True
+
+    def _run(self):
+        # The first check waits one interval; the initial load is the store's own
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.error(f"Scheduled refresh failed, retrying in {self.interval}s: {str(e)}")
+
+    def start(self):
+        if self.interval <= 0 or (self._thread is not None and self._thread.is_alive()):
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sheet-refresh", daemon=True)
+        self._thread.start()
+        logger.info(f"Refresh scheduler polling every {self.interval}s")
+        return self
+
+    def stop(self):
+        self._stop.set()
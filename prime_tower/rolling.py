@@ -0,0 +1,176 @@
+"""
+Rolling and period-over-period comparisons from monthly prefix sums.
+
+Additive measures are rolled up per (truck, route, month) from the
+monthly cube, then summed over months once per filter into cumulative
+totals. Any window (the selected range, the month before, the last 3, 6
+or 12 months and the window preceding each) is then a difference of two
+prefix rows, so comparisons cost O(1) per window instead of a re-filter
+of trip rows per window.
+
+Prefix sums are carried over between data versions: a new version only
+recomputes them from the first month whose totals changed, which for the
+append-only operations sheet is the latest month or two.
+"""
+
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from prime_tower.cube import OFFLOADING
+from prime_tower.filters import ALL
+
+WINDOWS = (3, 6, 12)
+
+# Rolled-up column -> monthly cube column
+MEASURES = {
+    "Revenue (R)": "Revenue (R) sum",
+    "Total Cost (R)": "Total Cost (R) sum",
+    "Profit (R)": "Profit (R) sum",
+    "Distance (km)": "Route Distance (km) sum",
+    "Cost per km sum": "Cost per km (R/km) sum",
+    "Cost per km count": "Cost per km (R/km) count",
+    "Trips": "Trips"
+}
+KEYS = ["TruckID", "Route Code", "Year-Month"]
+
+DEFAULT_MEMO_SIZE = 64
+
+
+def monthly_totals(month_cube):
+    """Additive measures per truck, route and month; tons count offloading rows only."""
+    frame = month_cube[KEYS].copy()
+    for column, source in MEASURES.items():
+        frame[column] = month_cube[source].astype("float64")
+    frame["Tons"] = month_cube["Ton Reg sum"].where(month_cube["Doc Type"] == OFFLOADING, 0).astype("float64")
+    return frame.groupby(KEYS, observed=True, dropna=False, sort=False).sum()
+
+
+def kpis(totals):
+    """KPI values from one row of summed measures."""
+    revenue = totals["Revenue (R)"]
+    count = totals["Cost per km count"]
+    return {
+        "Revenue (R)": revenue,
+        "Total Cost (R)": totals["Total Cost (R)"],
+        "Profit (R)": totals["Profit (R)"],
+        "Profit Margin": totals["Profit (R)"] / revenue if revenue > 0 else 0,
+        "Avg Cost/km (R)": totals["Cost per km sum"] / count if count else np.nan,
+        "Tons": totals["Tons"],
+        "Distance (km)": totals["Distance (km)"],
+        "Trips": totals["Trips"]
+    }
+
+
+def change(current, previous):
+    return (current - previous) / abs(previous) if previous else np.nan
+
+
+class RollingAggregates:
+    """
+    Prefix sums of monthly totals for ``months`` (chronological Year-Month
+    labels), built per filter on first use. Pass the aggregates of the
+    previous data version as ``previous`` to reuse its prefix sums for the
+    leading months that did not change.
+    """
+
+    def __init__(self, totals, months, previous=None, memo_size=DEFAULT_MEMO_SIZE):
+        self.totals = totals
+        self.months = list(months)
+        self.position = {month: i for i, month in enumerate(self.months)}
+        self.memo_size = memo_size
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self.stable_months = self._stable_months(previous) if previous is not None else 0
+        # Only the unchanged heads are kept, so versions do not chain in memory
+        self._carried = {
+            key: prefix.iloc[:self.stable_months] for key, prefix in previous._memo.items()
+        } if self.stable_months else {}
+
+    def _by_month(self, totals):
+        summed = totals.groupby(level="Year-Month", observed=True).sum()
+        summed.index = summed.index.astype(str)
+        return summed.reindex(self.months, fill_value=0.0)
+
+    def _stable_months(self, previous):
+        """Number of leading months whose per-truck, per-route totals are unchanged."""
+        old, new = previous.totals, self.totals
+        for i, month in enumerate(self.months):
+            if i >= len(previous.months) or previous.months[i] != month:
+                return i
+            old_month = old[old.index.get_level_values("Year-Month") == month].sort_index()
+            new_month = new[new.index.get_level_values("Year-Month") == month].sort_index()
+            if not old_month.equals(new_month):
+                return i
+        return len(self.months)
+
+    def _select(self, truck, route):
+        mask = np.ones(len(self.totals), dtype=bool)
+        if truck != ALL:
+            mask &= self.totals.index.get_level_values("TruckID") == truck
+        if route != ALL:
+            mask &= self.totals.index.get_level_values("Route Code") == route
+        return self.totals[mask]
+
+    def prefix(self, truck=ALL, route=ALL):
+        """Cumulative monthly totals (one row per month) for a truck/route filter."""
+        key = (truck, route)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        monthly = self._by_month(self._select(truck, route))
+        head = self._carried.get(key)
+        if head is not None:
+            prefix = pd.concat([head, monthly.iloc[self.stable_months:].cumsum() + head.iloc[-1]])
+        else:
+            prefix = monthly.cumsum()
+
+        with self._lock:
+            self._memo[key] = prefix
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return prefix
+
+    def window(self, last, length, truck=ALL, route=ALL):
+        """KPIs over ``length`` months ending at month ``last``; None without enough history."""
+        end = self.position.get(last)
+        if end is None or end - length + 1 < 0:
+            return None
+        prefix = self.prefix(truck, route)
+        totals = prefix.iloc[end] - (prefix.iloc[end - length] if end >= length else 0)
+        return kpis(totals)
+
+    def range_change(self, months, truck=ALL, route=ALL):
+        """(current, previous) KPIs for the contiguous ``months`` and the same-length window before it."""
+        if not months:
+            return None, None
+        length = len(months)
+        current = self.window(months[-1], length, truck, route)
+        start = self.position.get(months[0])
+        previous = self.window(self.months[start - 1], length, truck, route) if start else None
+        return current, previous
+
+    def comparison(self, months, truck=ALL, route=ALL):
+        """
+        One row per window: the selected range, the last month (MoM) and the
+        last 3/6/12 months, each ending at the last selected month, with the
+        change against the window of the same length before it.
+        """
+        last = months[-1]
+        windows = [("Selected range", len(months)), ("Month over month", 1)] + [(f"Last {w} months", w) for w in WINDOWS]
+        rows = []
+        for label, length in windows:
+            current = self.window(last, length, truck, route)
+            if current is None:
+                continue
+            end = self.position[last]
+            previous = self.window(self.months[end - length], length, truck, route) if end >= length else None
+            row = {"Window": label, "Months": length, **current}
+            for measure in ("Revenue (R)", "Profit (R)", "Tons"):
+                row[f"{measure} change"] = change(current[measure], previous[measure]) if previous else np.nan
+            rows.append(row)
+        return pd.DataFrame(rows)
@@ -0,0 +1,154 @@
+"""
+Declarative alert rule registry.
+
+A rule names an entity frame (``"trucks"``, ``"routes"``), a metric
+expression over its columns, a comparison and a threshold. All rules for
+an entity are compiled into one ``DataFrame.eval`` program and evaluated
+together over every row (every truck, every route-month), so adding a
+rule adds a column expression, not another scan over the data.
+
+Expressions use ``DataFrame.eval`` syntax; quote column names containing
+spaces with backticks.
+"""
+
+import pandas as pd
+
+SERVICE_INTERVAL_KM = 10000
+EXPIRY_WINDOW_DAYS = 30
+HIGH_VOLUME_QUANTILE = 0.75
+RATE_UPLIFT = 0.15
+
+# Truck PAK date column -> label used for the derived "<label> Days Left" column
+EXPIRY_FIELDS = {
+    "Vehicle License Expiry": "License Expiry",
+    "Driver License Expiry": "Driver License",
+    "GIT Insurance Expiry": "GIT Insurance"
+}
+
+OPERATORS = (">", ">=", "<", "<=", "==", "!=")
+
+
+class Quantile:
+    """Threshold at quantile ``q`` of the rule's metric within each group."""
+
+    def __init__(self, q):
+        self.q = q
+
+
+class Rule:
+    """
+    One alert rule.
+
+    Flags rows where ``metric <op> threshold`` (and ``where``, if given).
+    The flag is returned as column ``label``; ``value_label`` keeps the
+    metric itself and ``derive`` maps extra output columns to expressions
+    (e.g. a suggested rate).
+    """
+
+    def __init__(self, name, entity, metric, op, threshold, label, where=None, derive=None, value_label=None):
+        if not name.isidentifier():
+            raise ValueError(f"Rule name '{name}' must be a valid identifier")
+        if op not in OPERATORS:
+            raise ValueError(f"Unsupported operator '{op}' in rule '{name}'")
+        self.name = name
+        self.entity = entity
+        self.metric = metric
+        self.op = op
+        self.threshold = threshold
+        self.label = label
+        self.where = where
+        self.derive = dict(derive or {})
+        self.value_label = value_label
+
+    @property
+    def value_column(self):
+        return f"{self.name}_value"
+
+    @property
+    def threshold_column(self):
+        return f"{self.name}_threshold"
+
+    def metric_line(self):
+        return f"{self.value_column} = {self.metric}"
+
+    def flag_lines(self):
+        threshold = self.threshold_column if isinstance(self.threshold, Quantile) else repr(self.threshold)
+        test = f"({self.value_column} {self.op} {threshold})"
+        if self.where:
+            test = f"({self.where}) & {test}"
+        lines = [f"{self.name} = {test}"]
+        lines += [f"{self.name}_derived_{i} = {expr}" for i, expr in enumerate(self.derive.values())]
+        return lines
+
+    def outputs(self):
+        """Internal column -> published column."""
+        names = {self.name: self.label}
+        if self.value_label:
+            names[self.value_column] = self.value_label
+        names.update({f"{self.name}_derived_{i}": column for i, column in enumerate(self.derive)})
+        return names
+
+
+RULES = {}
+
+
+def register(rule):
+    if rule.name in RULES:
+        raise ValueError(f"Rule '{rule.name}' is already registered")
+    RULES[rule.name] = rule
+    return rule
+
+
+register(Rule(
+    "service_due", "trucks", "`Current Mileage` - `Last Service Mileage`", ">", SERVICE_INTERVAL_KM,
+    label="Service Due", value_label="KM Since Service"
+))
+for _column, _label in EXPIRY_FIELDS.items():
+    register(Rule(
+        _label.lower().replace(" ", "_") + "_expiring", "trucks", f"`{_label} Days Left`", "<=", EXPIRY_WINDOW_DAYS,
+        label=f"{_label} Expiring"
+    ))
+register(Rule(
+    "pricing_review", "routes", "`Ton Reg`", ">", Quantile(HIGH_VOLUME_QUANTILE),
+    label="Pricing Review", where="`Profit (R)` < 0",
+    derive={"Suggested Rate": f"`Rate per ton` * {1 + RATE_UPLIFT}"}
+))
+
+
+def truck_status(truck_pak, today):
+    """Truck PAK with expiry dates parsed and days left until each relative to ``today``."""
+    status = truck_pak.copy()
+    for column, label in EXPIRY_FIELDS.items():
+        status[column] = pd.to_datetime(status[column])
+        status[f"{label} Days Left"] = (status[column] - today).dt.days
+    return status
+
+
+def evaluate_rules(frame, entity, by=(), registry=None):
+    """
+    Evaluate every registered rule for ``entity`` over ``frame``.
+
+    Returns a copy of ``frame`` with one boolean column per rule (its
+    label) plus any kept metric and derived columns. Quantile thresholds
+    are computed within each ``by`` group, e.g. per ``Year-Month``.
+    """
+    by = list(by)
+    rules = [rule for rule in (RULES if registry is None else registry).values() if rule.entity == entity]
+    if not rules:
+        return frame.copy()
+
+    work = frame.eval("\n".join(rule.metric_line() for rule in rules))
+    for rule in rules:
+        if isinstance(rule.threshold, Quantile):
+            values = work[rule.value_column]
+            work[rule.threshold_column] = (
+                values.groupby([work[column] for column in by], observed=True).transform("quantile", rule.threshold.q)
+                if by else values.quantile(rule.threshold.q)
+            )
+    work = work.eval("\n".join(line for rule in rules for line in rule.flag_lines()))
+
+    names = {}
+    for rule in rules:
+        names.update(rule.outputs())
+    published = work[list(names)].rename(columns=names)
+    return pd.concat([frame.drop(columns=published.columns, errors="ignore"), published], axis=1)
@@ -0,0 +1,136 @@
+"""
+Compact column types for the five source tables.
+
+Sheet data arrives as object columns (or whatever get_all_records and
+Parquet inferred). Several Streamlit sessions hold these frames at once,
+so IDs become categoricals, whole-number mileages the smallest integer
+type that holds them and dates datetime64.
+
+Measures (tonnage, distances, rates and costs) stay float64: every one of
+them feeds revenue, cost or km/L totals, and precision dropped at load
+cannot be recovered by later float64 arithmetic.
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CATEGORY = "category"
+FLOAT = "float64"
+INTEGER = "integer"
+DATETIME = "datetime"
+
+SCHEMAS = {
+    "operations": {
+        "Date": DATETIME,
+        "TruckID": CATEGORY,
+        "Route Code": CATEGORY,
+        "Doc Type": CATEGORY,
+        "Driver Name": CATEGORY,
+        "Ton Reg": FLOAT
+    },
+    "tracker": {
+        "Date": DATETIME,
+        "TruckID": CATEGORY,
+        "Distance (km)": FLOAT
+    },
+    "loi": {
+        "Route Code": CATEGORY,
+        "Rate per ton": FLOAT,
+        "Distance (km)": FLOAT
+    },
+    "truck_pak": {
+        "TruckID": CATEGORY,
+        "Driver Name": CATEGORY,
+        "Current Mileage": INTEGER,
+        "Last Service Mileage": INTEGER,
+        "Vehicle License Expiry": DATETIME,
+        "Driver License Expiry": DATETIME,
+        "GIT Insurance Expiry": DATETIME
+    },
+    "vcs": {
+        "TruckID": CATEGORY,
+        "Fuel Cost (R/km)": FLOAT,
+        "Maintenance Cost (R/km)": FLOAT,
+        "Tyres (R/km)": FLOAT,
+        "Daily Fixed Cost (R/day)": FLOAT
+    }
+}
+
+TABLE_ORDER = ("operations", "tracker", "loi", "truck_pak", "vcs")
+
+
+def _as_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    if pd.api.types.is_numeric_dtype(series):
+        # IDs stored as numbers (e.g. 101.0 after a blank cell) keep their sheet spelling
+        whole = series.dropna()
+        if (whole == np.floor(whole)).all():
+            series = series.astype("Int64")
+        series = series.astype("string")
+    else:
+        series = series.where(series.isna(), series.astype(str).str.strip())
+        series = series.replace("", np.nan)
+    return series.astype(CATEGORY)
+
+
+def _as_integer(series):
+    numeric = pd.to_numeric(series, errors="coerce")
+    if numeric.notna().all() and (numeric == np.floor(numeric)).all():
+        # int32 at minimum so mileage differences cannot overflow
+        fits = numeric.abs().max() < np.iinfo(np.int32).max if len(numeric) else True
+        return numeric.astype("int32" if fits else "int64")
+    return numeric.astype(FLOAT)
+
+
+def coerce_column(series, kind):
+    if kind == CATEGORY:
+        return _as_category(series)
+    if kind == FLOAT:
+        return pd.to_numeric(series, errors="coerce").astype(FLOAT)
+    if kind == INTEGER:
+        return _as_integer(series)
+    if kind == DATETIME:
+        return pd.to_datetime(series, errors="coerce", format="mixed")
+    raise ValueError(f"Unknown column kind: {kind}")
+
+
+def coerce_table(df, schema):
+    """Return a copy of ``df`` with the schema's columns converted; other columns are left alone."""
+    df = df.copy()
+    for col, kind in schema.items():
+        if col in df.columns:
+            df[col] = coerce_column(df[col], kind)
+    return df
+
+
+def memory_bytes(df):
+    return int(df.memory_usage(deep=True).sum())
+
+
+def apply_schemas(tables):
+    """
+    Coerce the five source tables (dashboard order) to compact dtypes.
+
+    Returns ``(tables, report)`` where ``report`` maps table name to its
+    memory use in bytes before and after.
+    """
+    compact, report = [], {}
+    for name, df in zip(TABLE_ORDER, tables):
+        before = memory_bytes(df)
+        df = coerce_table(df, SCHEMAS[name])
+        after = memory_bytes(df)
+        report[name] = {"before": before, "after": after}
+        compact.append(df)
+
+    total_before = sum(r["before"] for r in report.values())
+    total_after = sum(r["after"] for r in report.values())
+    logger.info(
+        f"Compact dtypes: {total_before / 1e6:.2f} MB -> {total_after / 1e6:.2f} MB ("
+        + ", ".join(f"{n} {r['before'] / 1e6:.2f}->{r['after'] / 1e6:.2f}" for n, r in report.items()) + ")"
+    )
+    return tuple(compact), report
@@ -0,0 +1,125 @@
+"""
+Predictive service scheduling from mileage velocity.
+
+Each truck's daily km rate is its distance over the trailing
+``VELOCITY_WINDOW_DAYS`` of history (idle days count as zero), from the
+tracker where the truck has tracker days in the window and otherwise from
+the route distance of its deliveries. The km left to the service
+interval, divided by that rate, gives the day the truck is due; services
+after that follow every ``interval / rate`` days. All of it is a handful
+of grouped and broadcast operations over the whole fleet.
+"""
+
+import numpy as np
+import pandas as pd
+
+from prime_tower.cube import OFFLOADING
+from prime_tower.model import aggregate_tracker_distance, lookup_table
+from prime_tower.rules import SERVICE_INTERVAL_KM
+
+VELOCITY_WINDOW_DAYS = 28
+HORIZON_WEEKS = 8
+
+TRACKER = "tracker"
+OPERATIONS = "operations"
+
+
+def _window_km(daily, end, days):
+    """Distance per truck over the ``days`` days ending at ``end``."""
+    recent = daily[(daily["Day"] > end - pd.Timedelta(days=days)) & (daily["Day"] <= end)]
+    return recent.groupby(recent["TruckID"].astype(str))["Distance (km)"].sum()
+
+
+def daily_km_rates(operations, tracker, loi, window_days=VELOCITY_WINDOW_DAYS):
+    """
+    km per day per truck over the trailing window ending at the last day
+    of data. Returns a frame indexed by TruckID with ``Daily km`` and
+    ``Velocity Source``.
+    """
+    end = operations["Date_only"].max() if "Date_only" in operations.columns else pd.NaT
+
+    tracked = pd.Series(dtype="float64")
+    if not tracker.empty and {"TruckID", "Distance (km)"} <= set(tracker.columns):
+        daily, keys = aggregate_tracker_distance(tracker)
+        if "Day" in keys:
+            end = max(end, daily["Day"].max()) if pd.notna(end) else daily["Day"].max()
+            tracked = _window_km(daily, end, window_days)
+
+    delivered = pd.Series(dtype="float64")
+    if pd.notna(end) and "Distance (km)" in loi.columns:
+        trips = operations[operations["Doc Type"] == OFFLOADING][["TruckID", "Route Code", "Date_only"]]
+        trips = trips.merge(lookup_table(loi, "Route Code", ["Distance (km)"], "loi"),
+                            on="Route Code", how="left", validate="many_to_one")
+        trips = trips.rename(columns={"Date_only": "Day"})
+        trips["Distance (km)"] = pd.to_numeric(trips["Distance (km)"], errors="coerce").fillna(0)
+        delivered = _window_km(trips, end, window_days)
+
+    rates = pd.DataFrame({TRACKER: tracked, OPERATIONS: delivered}).astype("float64")
+    use_tracker = rates[TRACKER] > 0
+    return pd.DataFrame({
+        "Daily km": np.where(use_tracker, rates[TRACKER], rates[OPERATIONS].fillna(0)) / window_days,
+        "Velocity Source": np.where(use_tracker, TRACKER, OPERATIONS)
+    }, index=rates.index.rename("TruckID"))
+
+
+def project_services(truck_pak, rates, today, interval=SERVICE_INTERVAL_KM):
+    """
+    Next service per truck: km left to the interval from the truck PAK
+    mileage, days until due at the truck's daily km rate, and the due date
+    (today for overdue trucks, NaT for trucks with no recent distance).
+    """
+    trucks = truck_pak[["TruckID", "Driver Name", "Current Mileage", "Last Service Mileage"]].copy()
+    trucks["TruckID"] = trucks["TruckID"].astype(str)
+    trucks = trucks.merge(rates.reset_index(), on="TruckID", how="left", validate="many_to_one")
+    trucks["Daily km"] = trucks["Daily km"].fillna(0.0)
+    trucks["Velocity Source"] = trucks["Velocity Source"].fillna("none")
+
+    since = pd.to_numeric(trucks["Current Mileage"], errors="coerce") - pd.to_numeric(trucks["Last Service Mileage"], errors="coerce")
+    trucks["KM Since Service"] = since
+    trucks["KM Left"] = interval - since
+    moving = trucks["Daily km"] > 0
+    days = np.ceil(trucks["KM Left"].clip(lower=0) / trucks["Daily km"].where(moving))
+    trucks["Days Until Due"] = days
+    trucks["Due Date"] = today + pd.to_timedelta(days, unit="D")
+    trucks["Overdue"] = trucks["KM Left"] <= 0
+    trucks["Cycle Days"] = interval / trucks["Daily km"].where(moving)
+    return trucks
+
+
+def service_calendar(projection, today, weeks=HORIZON_WEEKS):
+    """
+    Every service falling in the next ``weeks`` weeks, repeat services of
+    fast-moving trucks included: one row per truck and service.
+    """
+    horizon = weeks * 7
+    due = projection[projection["Days Until Due"].notna() & (projection["Days Until Due"] < horizon)]
+    first = due["Days Until Due"].to_numpy()
+    cycle = due["Cycle Days"].to_numpy()
+    counts = (np.floor((horizon - 1 - first) / cycle) + 1).astype(np.int64)
+
+    rows = np.repeat(np.arange(len(due)), counts)
+    # Service number within each truck's run: 0 for the first, 1 for the next, ...
+    nth = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+    offsets = np.floor(first[rows] + nth * cycle[rows])
+    calendar = due.iloc[rows][["TruckID", "Driver Name", "Daily km", "Overdue"]].reset_index(drop=True)
+    calendar["Service"] = nth + 1
+    calendar["Overdue"] = calendar["Overdue"] & (nth == 0)
+    calendar["Due Date"] = today + pd.to_timedelta(offsets, unit="D")
+    calendar["Week"] = calendar["Due Date"].dt.to_period("W-SUN").dt.start_time
+    return calendar.sort_values(["Due Date", "TruckID"]).reset_index(drop=True)
+
+
+def weekly_load(calendar, today, weeks=HORIZON_WEEKS, capacity=None):
+    """Services per week (Monday start) over the horizon; ``capacity`` adds an over-capacity flag."""
+    first = pd.Timestamp(today).to_period("W-SUN").start_time
+    last = (pd.Timestamp(today) + pd.Timedelta(days=weeks * 7 - 1)).to_period("W-SUN").start_time
+    grouped = calendar.groupby("Week")
+    load = pd.DataFrame({
+        "Services": grouped.size(),
+        "Overdue": grouped["Overdue"].sum(),
+        "Trucks": grouped["TruckID"].agg(", ".join)
+    }).reindex(pd.date_range(first, last, freq="7D")).rename_axis("Week")
+    load = load.fillna({"Services": 0, "Overdue": 0, "Trucks": ""}).astype({"Services": "int64", "Overdue": "int64"})
+    if capacity is not None:
+        load["Over Capacity"] = load["Services"] > capacity
+    return load.reset_index()
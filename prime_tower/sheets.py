@@ -0,0 +1,137 @@
+"""
+Google Sheets access for the PrimeTower source workbook.
+
+The workbook is opened once and all source worksheets are fetched with a
+single batched values request, falling back to a bounded thread pool of
+per-sheet reads if the batch call fails.
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import gspread
+from google.oauth2 import service_account
+
+logger = logging.getLogger(__name__)
+
+SPREADSHEET_KEY = "1QYHK9DoiBjJPLrQlovHxDkRuv4xImwtzbokul_rOdjI"
+
+SCOPES = [
+    "https://spreadsheets.google.com/feeds",
+    "https://www.googleapis.com/auth/drive"
+]
+
+# Worksheet names in the order the dashboard unpacks them
+SOURCE_SHEETS = ("operations", "tracker", "loi", "truck_pak", "vehicle_cost_schedule")
+
+# Numbers come back as numbers, dates as the strings shown in the sheet
+VALUE_PARAMS = {
+    "valueRenderOption": "UNFORMATTED_VALUE",
+    "dateTimeRenderOption": "FORMATTED_STRING"
+}
+
+MAX_FETCH_WORKERS = 5
+
+
+def build_client(creds_info):
+    creds = service_account.Credentials.from_service_account_info(dict(creds_info), scopes=SCOPES)
+    return gspread.authorize(creds)
+
+
+def open_spreadsheet(client, key=SPREADSHEET_KEY):
+    return client.open_by_key(key)
+
+
+def values_to_frame(values):
+    """Turn a raw values grid (header row first) into a DataFrame like get_all_records()."""
+    if not values:
+        return pd.DataFrame()
+    header = [str(h) for h in values[0]]
+    width = len(header)
+    rows = [list(r[:width]) + [""] * (width - len(r)) for r in values[1:]]
+    return pd.DataFrame(rows, columns=header)
+
+
+def sheet_range(sheet_name, cells=None):
+    """A1 range for a whole sheet, or ``cells`` within it, with the name quoted."""
+    quoted = "'{}'".format(sheet_name.replace("'", "''"))
+    return f"{quoted}!{cells}" if cells else quoted
+
+
+def fetch_values(spreadsheet, ranges):
+    """Fetch several A1 ranges in one round-trip; returns one values grid per range."""
+    response = spreadsheet.values_batch_get(list(ranges), params=VALUE_PARAMS)
+    value_ranges = response.get("valueRanges", [])
+    return [vr.get("values", []) for vr in value_ranges] + [[]] * (len(ranges) - len(value_ranges))
+
+
+def _fetch_batched(spreadsheet, sheet_names):
+    start = time.perf_counter()
+    grids = fetch_values(spreadsheet, [sheet_range(name) for name in sheet_names])
+    request_time = time.perf_counter() - start
+
+    frames, timings = {}, {}
+    for name, values in zip(sheet_names, grids):
+        parse_start = time.perf_counter()
+        frames[name] = values_to_frame(values)
+        # Every sheet shares the single round-trip; parse time is its own
+        timings[name] = request_time + (time.perf_counter() - parse_start)
+    return frames, timings
+
+
+def _fetch_one(spreadsheet, sheet_name):
+    start = time.perf_counter()
+    try:
+        values = spreadsheet.worksheet(sheet_name).get_values(
+            value_render_option=VALUE_PARAMS["valueRenderOption"],
+            date_time_render_option=VALUE_PARAMS["dateTimeRenderOption"]
+        )
+        df = values_to_frame(values)
+    except Exception as e:
+        logger.error(f"Error loading worksheet {sheet_name}: {str(e)}")
+        df = pd.DataFrame()
+    return df, time.perf_counter() - start
+
+
+def _fetch_threaded(spreadsheet, sheet_names, max_workers):
+    frames, timings = {}, {}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(sheet_names))) as pool:
+        results = pool.map(lambda name: _fetch_one(spreadsheet, name), sheet_names)
+        for name, (df, elapsed) in zip(sheet_names, results):
+            frames[name] = df
+            timings[name] = elapsed
+    return frames, timings
+
+
+def modified_time(spreadsheet):
+    """Workbook modified time (Drive metadata, no cell reads) as epoch seconds."""
+    return pd.Timestamp(spreadsheet.get_lastUpdateTime()).timestamp()
+
+
+def fetch_worksheets(spreadsheet, sheet_names=SOURCE_SHEETS, max_workers=MAX_FETCH_WORKERS):
+    """
+    Fetch several worksheets from an open spreadsheet.
+
+    Returns ``(frames, timings)``: dicts keyed by sheet name holding the
+    DataFrame and the seconds spent obtaining it. Sheets that fail to load
+    come back as empty DataFrames.
+    """
+    sheet_names = list(sheet_names)
+    if not sheet_names:
+        return {}, {}
+
+    try:
+        frames, timings = _fetch_batched(spreadsheet, sheet_names)
+        mode = "batched"
+    except Exception as e:
+        logger.warning(f"Batched sheet fetch failed, falling back to per-sheet reads: {str(e)}")
+        frames, timings = _fetch_threaded(spreadsheet, sheet_names, max_workers)
+        mode = "threaded"
+
+    for name in sheet_names:
+        frames.setdefault(name, pd.DataFrame())
+        logger.info(f"Loaded worksheet {name} ({mode}): {len(frames[name])} rows in {timings.get(name, 0.0):.2f}s")
+    return frames, timings
+
@@ -0,0 +1,243 @@
+"""
+On-disk columnar snapshot of the five source tables.
+
+Snapshots are Parquet files plus a small ``meta.json`` recording when they
+were taken and a content fingerprint per table. A refresh only rewrites
+tables whose fingerprint changed and only then bumps the version, so
+unchanged data keeps every downstream cache warm.
+
+``SnapshotStore`` serves whatever snapshot is on disk straight away and,
+once it is older than the TTL, refreshes it on a background thread
+(stale-while-revalidate) so no rerun waits on Google Sheets except the
+very first one. Given the source's ``modified_time``, that refresh first
+makes the same cheap check as ``RefreshScheduler`` and only refetches
+the sheets when the source changed since the snapshot was last checked;
+the TTL then only matters when the scheduler is off or its polls fail.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from prime_tower import config
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAMES = ("operations", "tracker", "loi", "truck_pak", "vcs")
+
+META_FILE = "meta.json"
+
+# Allowance for clock differences between Drive and this host
+CLOCK_SKEW = 60
+
+
+def arrow_safe(df):
+    """
+    Make object columns storable in Parquet.
+
+    Sheet columns mix numbers with "" for blank cells: those become numeric
+    with NaN blanks, any other mixed column is stored as text.
+    """
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        values = df[col]
+        blank = values.isna() | values.astype(str).str.strip().eq("")
+        numeric = pd.to_numeric(values.where(~blank), errors="coerce")
+        if numeric[~blank].notna().all() and (~blank).any():
+            df[col] = numeric
+        else:
+            df[col] = values.where(values.isna(), values.astype(str))
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def _table_path(directory, name):
+    return os.path.join(directory, f"{name}.parquet")
+
+
+def read_meta(directory):
+    try:
+        with open(os.path.join(directory, META_FILE)) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def fingerprint(df):
+    """Content hash of a fetched table (values and column names)."""
+    row_hashes = pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+    columns = pd.util.hash_pandas_object(pd.Series([str(c) for c in df.columns]), index=False).to_numpy()
+    return format(int(row_hashes.sum(dtype="uint64") ^ columns.sum(dtype="uint64")), "016x")
+
+
+def write_snapshot(directory, tables):
+    """
+    Persist the tables that changed since the last snapshot and return the
+    new meta. ``None`` or an empty table keeps the previous snapshot's copy;
+    the version only changes when at least one table was rewritten.
+    """
+    os.makedirs(directory, exist_ok=True)
+    previous = read_meta(directory) or {}
+    fingerprints = dict(previous.get("fingerprints", {}))
+    changed = []
+    for name, df in zip(TABLE_NAMES, tables):
+        path = _table_path(directory, name)
+        if df is None or df.empty:
+            if os.path.exists(path):
+                if df is not None:
+                    logger.warning(f"Fetched {name} is empty, keeping previous snapshot copy")
+                continue
+            df = pd.DataFrame() if df is None else df
+        digest = fingerprint(df)
+        if digest == fingerprints.get(name) and os.path.exists(path):
+            continue
+        arrow_safe(df).to_parquet(path + ".tmp", index=False)
+        os.replace(path + ".tmp", path)
+        fingerprints[name] = digest
+        changed.append(name)
+
+    now = time.time()
+    if changed or "version" not in previous:
+        meta = {
+            "version": datetime.now().isoformat(timespec="microseconds"),
+            "created_at": now,
+            "checked_at": now,
+            "changed": changed,
+            "fingerprints": fingerprints
+        }
+    else:
+        meta = dict(previous, checked_at=now)
+    meta_path = os.path.join(directory, META_FILE)
+    with open(meta_path + ".tmp", "w") as fh:
+        json.dump(meta, fh)
+    os.replace(meta_path + ".tmp", meta_path)
+    return meta
+
+
+def touch_meta(directory):
+    """Record that the source was checked and found unchanged."""
+    meta = dict(read_meta(directory), checked_at=time.time())
+    meta_path = os.path.join(directory, META_FILE)
+    with open(meta_path + ".tmp", "w") as fh:
+        json.dump(meta, fh)
+    os.replace(meta_path + ".tmp", meta_path)
+    return meta
+
+
+def read_snapshot(directory):
+    """Return the five tables in dashboard order."""
+    return tuple(pd.read_parquet(_table_path(directory, name)) for name in TABLE_NAMES)
+
+
+class SnapshotStore:
+    """
+    Stale-while-revalidate wrapper around a ``fetch`` callable that returns
+    the five source tables. ``modified_time`` (optional, epoch seconds)
+    lets the TTL refresh skip the fetch when the source has not changed.
+    """
+
+    def __init__(self, fetch, directory=None, ttl=None, modified_time=None):
+        self.fetch = fetch
+        self.modified_time = modified_time
+        self.directory = directory or os.path.join(config.DATA_DIR, "snapshot")
+        self.ttl = config.SNAPSHOT_TTL if ttl is None else ttl
+        self._lock = threading.Lock()
+        # Serializes snapshot writes against reads (scheduler, SWR refresh and readers)
+        self._io_lock = threading.RLock()
+        # Held for a whole fetch and write, so the scheduler and SWR refresh never fetch at once
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+
+    def version(self):
+        meta = read_meta(self.directory)
+        return meta["version"] if meta else None
+
+    def age(self):
+        """Seconds since the source was last checked, changed or not."""
+        meta = read_meta(self.directory)
+        return time.time() - meta.get("checked_at", meta["created_at"]) if meta else None
+
+    def refresh(self, blocking=True):
+        """
+        Fetch the source and write the snapshot; returns the new version.
+        Only one refresh runs at a time: the fetch syncs the operations
+        store on disk and is the expensive Sheets read. With ``blocking``
+        False a refresh already running makes this return None at once.
+        """
+        if not self._refresh_lock.acquire(blocking=blocking):
+            logger.info("Snapshot refresh already running, skipping this one")
+            return None
+        try:
+            start = time.perf_counter()
+            tables = self.fetch()
+            with self._io_lock:
+                previous = self.version()
+                meta = write_snapshot(self.directory, tables)
+        finally:
+            self._refresh_lock.release()
+        if meta["version"] != previous:
+            logger.info(f"Snapshot {meta['version']} written in {time.perf_counter() - start:.2f}s "
+                        f"(changed: {', '.join(meta['changed'])})")
+        else:
+            logger.info(f"Source unchanged, snapshot {meta['version']} kept ({time.perf_counter() - start:.2f}s)")
+        return meta["version"]
+
+    def changed_since_check(self, modified):
+        """Whether a source modified at ``modified`` (epoch seconds) is newer than the last check."""
+        age = self.age()
+        return age is None or modified >= time.time() - age - CLOCK_SKEW
+
+    def _source_unchanged(self):
+        if self.modified_time is None:
+            return False
+        try:
+            return not self.changed_since_check(self.modified_time())
+        except Exception as e:
+            logger.warning(f"Source modified-time check failed, refetching: {str(e)}")
+            return False
+
+    def _background_refresh(self):
+        try:
+            if self._source_unchanged():
+                with self._io_lock:
+                    touch_meta(self.directory)
+                logger.info(f"Source unchanged, snapshot {self.version()} kept without refetching")
+                return
+            self.refresh(blocking=False)
+        except Exception as e:
+            logger.error(f"Background snapshot refresh failed, serving stale data: {str(e)}")
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def ensure_fresh(self):
+        """
+        Return the version to serve. Only blocks when no snapshot exists;
+        a stale snapshot is returned as-is while a refresh runs behind it.
+        """
+        age = self.age()
+        if age is None:
+            with self._lock:
+                if self.version() is None:
+                    return self.refresh()
+            return self.version()
+
+        if age > self.ttl:
+            with self._lock:
+                if self._refreshing:
+                    return self.version()
+                self._refreshing = True
+            logger.info(f"Snapshot is {age:.0f}s old, refreshing in background")
+            threading.Thread(target=self._background_refresh, name="snapshot-refresh", daemon=True).start()
+        return self.version()
+
+    def read(self):
+        with self._io_lock:
+            return read_snapshot(self.directory)
@@ -0,0 +1,115 @@
+"""
+Process-wide store for derived, read-only datasets.
+
+Every session viewing the same data version and filter gets the same
+entry: the first request computes it while concurrent requests for the
+same key wait for that result instead of computing their own. Every hit
+gets a shallow copy of the stored frames: the column data is shared, not
+copied, and copy-on-write keeps any change a session makes to its copy
+(values or columns) out of the stored entry. The memory cap counts the
+frames as held (``memory_usage(deep=True)``), and entries are evicted
+least recently used once the store exceeds it or its entry limit.
+"""
+
+import logging
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+from prime_tower import profiling
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_ENTRIES = 1024
+
+# Always on from pandas 3; without it a shallow copy writes through to the shared data
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+def share(value):
+    """Per-caller view of a stored value: frames are shallow, copy-on-write copies."""
+    if isinstance(value, pd.DataFrame):
+        return value.copy(deep=False)
+    if isinstance(value, dict):
+        return {k: share(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(share(v) for v in value)
+    return value
+
+
+def nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, dict):
+        return sum(nbytes(v) for v in value.values())
+    if isinstance(value, (list, tuple)):
+        return sum(nbytes(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class SharedStore:
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key, compute):
+        """Return the value for ``key``, running ``compute()`` at most once across concurrent callers."""
+        while True:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    value = self._entries[key][0]
+                    break
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = threading.Event()
+            if pending is None:
+                profiling.cache_miss()
+                return self._compute(key, compute)
+            # Another session is computing this view; if it fails we retry as the owner
+            pending.wait()
+
+        profiling.cache_lookup()
+        return share(value)
+
+    def _compute(self, key, compute):
+        try:
+            value = compute()
+            size = nbytes(value)
+            with self._lock:
+                self.misses += 1
+                if size <= self.max_bytes:
+                    self._entries[key] = (value, size)
+                    self.bytes += size
+                    self._evict()
+                else:
+                    logger.warning(f"Shared store entry of {size / 1e6:.1f} MB exceeds the cap, not stored")
+        finally:
+            with self._lock:
+                self._inflight.pop(key).set()
+        return share(value)
+
+    def _evict(self):
+        while self._entries and (self.bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+
+    def stats(self):
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self.bytes, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
@@ -0,0 +1,161 @@
+"""
+Incremental (append-only) sync of the operations worksheet.
+
+The operations sheet only grows, so after the first full download we keep
+the ingested rows on disk together with the sheet row number, the raw
+values of the last row and the latest trip date seen. Each sync then asks
+the Sheets API for the header plus everything from that last row onwards:
+the overlapping row proves the history is unchanged and the rest are the
+newly appended trips. A changed header or a different value in the last
+ingested row (rows deleted, sorted or rewritten) falls back to a full
+reload.
+"""
+
+import json
+import logging
+import os
+from datetime import datetime
+
+import pandas as pd
+from gspread.utils import rowcol_to_a1
+
+from prime_tower import config
+from prime_tower.sheets import fetch_values, sheet_range, values_to_frame
+
+logger = logging.getLogger(__name__)
+
+OPERATIONS_SHEET = "operations"
+
+# The header lives on sheet row 1, data starts on row 2
+HEADER_ROW = 1
+
+
+def _store_paths(store_dir, sheet_name):
+    return (
+        os.path.join(store_dir, f"{sheet_name}.pkl"),
+        os.path.join(store_dir, f"{sheet_name}.state.json")
+    )
+
+
+def load_store(store_dir, sheet_name=OPERATIONS_SHEET):
+    """Return the persisted ``(frame, state)`` or ``(None, None)`` if there is none."""
+    frame_path, state_path = _store_paths(store_dir, sheet_name)
+    if not (os.path.exists(frame_path) and os.path.exists(state_path)):
+        return None, None
+    try:
+        with open(state_path) as fh:
+            state = json.load(fh)
+        return pd.read_pickle(frame_path), state
+    except Exception as e:
+        logger.warning(f"Discarding unreadable {sheet_name} store: {str(e)}")
+        return None, None
+
+
+def save_store(store_dir, df, state, sheet_name=OPERATIONS_SHEET):
+    os.makedirs(store_dir, exist_ok=True)
+    frame_path, state_path = _store_paths(store_dir, sheet_name)
+    # Write to temp files first so a crash never leaves a half-written store
+    df.to_pickle(frame_path + ".tmp")
+    with open(state_path + ".tmp", "w") as fh:
+        json.dump(state, fh)
+    os.replace(frame_path + ".tmp", frame_path)
+    os.replace(state_path + ".tmp", state_path)
+
+
+def _pad(row, width):
+    row = list(row[:width])
+    return row + [""] * (width - len(row))
+
+
+def _last_date(df, previous=None):
+    if "Date" not in df.columns or df.empty:
+        return previous
+    latest = pd.to_datetime(df["Date"], errors="coerce").max()
+    return previous if pd.isna(latest) else latest.isoformat()
+
+
+def _build_state(sheet_name, header, rows, df):
+    return {
+        "sheet": sheet_name,
+        "header": header,
+        "last_row": HEADER_ROW + len(rows),
+        "last_row_values": _pad(rows[-1], len(header)) if rows else None,
+        "last_date": _last_date(df),
+        "synced_at": datetime.now().isoformat(timespec="seconds")
+    }
+
+
+def delta_ranges(state, sheet_name=OPERATIONS_SHEET):
+    """A1 ranges for one sync round-trip: the header row and the tail from the last ingested row."""
+    last_col = rowcol_to_a1(1, len(state["header"])).rstrip("0123456789")
+    return [
+        sheet_range(sheet_name, f"{HEADER_ROW}:{HEADER_ROW}"),
+        sheet_range(sheet_name, f"A{state['last_row']}:{last_col}")
+    ]
+
+
+def apply_delta(df, state, header_values, tail_values):
+    """
+    Merge a fetched tail into the stored frame.
+
+    Returns ``(frame, state)`` on success or ``None`` when the sheet no
+    longer matches what was ingested and a full reload is required.
+    """
+    header = [str(h) for h in (header_values[0] if header_values else [])]
+    if header != state["header"]:
+        logger.info(f"{state['sheet']} header changed, full reload required")
+        return None
+
+    width = len(header)
+    if state["last_row"] > HEADER_ROW:
+        if not tail_values or _pad(tail_values[0], width) != state["last_row_values"]:
+            logger.info(f"{state['sheet']} history was edited, full reload required")
+            return None
+        new_rows = [_pad(r, width) for r in tail_values[1:]]
+    else:
+        new_rows = [_pad(r, width) for r in tail_values]
+
+    if not new_rows:
+        state = dict(state, synced_at=datetime.now().isoformat(timespec="seconds"))
+        return df, state
+
+    delta = values_to_frame([header] + new_rows)
+    merged = pd.concat([df, delta], ignore_index=True)
+    new_state = dict(
+        state,
+        last_row=state["last_row"] + len(new_rows),
+        last_row_values=new_rows[-1],
+        last_date=_last_date(delta, state.get("last_date")),
+        synced_at=datetime.now().isoformat(timespec="seconds")
+    )
+    logger.info(f"Appended {len(new_rows)} new {state['sheet']} rows (now {len(merged)})")
+    return merged, new_state
+
+
+def full_reload(spreadsheet, store_dir, sheet_name=OPERATIONS_SHEET):
+    values = fetch_values(spreadsheet, [sheet_range(sheet_name)])[0]
+    df = values_to_frame(values)
+    header = [str(h) for h in values[0]] if values else []
+    rows = values[1:] if values else []
+    state = _build_state(sheet_name, header, rows, df)
+    if header:
+        save_store(store_dir, df, state, sheet_name)
+    logger.info(f"Full reload of {sheet_name}: {len(df)} rows")
+    return df
+
+
+def sync_operations(spreadsheet, store_dir=None, sheet_name=OPERATIONS_SHEET):
+    """Return the full operations frame, downloading only rows appended since the last sync."""
+    store_dir = store_dir or config.DATA_DIR
+    df, state = load_store(store_dir, sheet_name)
+    if df is None or not state.get("header"):
+        return full_reload(spreadsheet, store_dir, sheet_name)
+
+    header_values, tail_values = fetch_values(spreadsheet, delta_ranges(state, sheet_name))
+    result = apply_delta(df, state, header_values, tail_values)
+    if result is None:
+        return full_reload(spreadsheet, store_dir, sheet_name)
+
+    merged, new_state = result
+    save_store(store_dir, merged, new_state, sheet_name)
+    return merged
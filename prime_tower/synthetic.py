@@ -0,0 +1,142 @@
+"""
+Synthetic fleet data in the shape of the five source sheets.
+
+Generates operations, tracker, loi, truck_pak and vcs tables for any
+fleet size and history length, for demo mode and benchmarks::
+
+    python -m prime_tower.synthetic --trucks 10 --months 3 --out data
+
+Each truck works most days on a preferred route (a Loading and an
+Offloading row per trip), refuels every few days, and reports a daily
+tracker distance. Generation is vectorized over the truck × day grid, so
+thousands of trucks over several years take seconds.
+"""
+
+import argparse
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+
+TABLE_NAMES = ("operations", "tracker", "loi", "truck_pak", "vcs")
+
+# Named scales: (trucks, months)
+SCALES = {
+    "small": (10, 3),
+    "medium": (100, 12),
+    "large": (1000, 24),
+    "xlarge": (3000, 36)
+}
+
+CITIES = ("JHB", "PTA", "DBN", "CPT", "PE", "BFN", "RBG", "NLP", "PLK", "KIM", "MHK", "EL")
+
+TRIP_PROBABILITY = 0.8
+FUEL_PROBABILITY = 0.35
+
+
+def route_codes(count):
+    pairs = [f"{a}-{b}" for a, b in itertools.permutations(CITIES, 2)]
+    return [pairs[i % len(pairs)] + (f"-{i // len(pairs) + 1}" if i >= len(pairs) else "") for i in range(count)]
+
+
+def generate_fleet(trucks=10, months=3, routes=None, start="2024-01-01", today=None, seed=0):
+    """Return the five source tables, ordered as ``TABLE_NAMES``."""
+    rng = np.random.default_rng(seed)
+    routes = routes or max(5, trucks // 4)
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    start = pd.Timestamp(start)
+    days = pd.date_range(start, start + pd.DateOffset(months=months) - pd.Timedelta(days=1), freq="D")
+
+    truck_ids = np.array([f"PT{i:04d}" for i in range(trucks)])
+    route_ids = np.array(route_codes(routes))
+    route_km = rng.integers(80, 1500, size=routes).astype(float)
+    loi = pd.DataFrame({
+        "Route Code": route_ids,
+        # Longer routes earn more per ton, with some negotiated spread
+        "Rate per ton": np.round(120 + route_km * 0.3 * rng.uniform(0.7, 1.3, size=routes), 2),
+        "Distance (km)": route_km
+    })
+
+    # Truck × day grid; each truck mostly runs its home route
+    truck_idx, day_idx = np.divmod(np.arange(trucks * len(days)), len(days))
+    home_route = rng.integers(0, routes, size=trucks)
+    route_idx = np.where(rng.random(truck_idx.size) < 0.7, home_route[truck_idx], rng.integers(0, routes, size=truck_idx.size))
+    trip = rng.random(truck_idx.size) < TRIP_PROBABILITY
+    fuel = rng.random(truck_idx.size) < FUEL_PROBABILITY
+
+    loaded = np.round(rng.uniform(28, 34, size=trip.sum()), 2)
+    trip_rows = {
+        "Date": days[day_idx[trip]], "TruckID": truck_ids[truck_idx[trip]], "Route Code": route_ids[route_idx[trip]]
+    }
+    operations = pd.concat([
+        pd.DataFrame({**trip_rows, "Doc Type": "Loading", "Ton Reg": loaded}),
+        pd.DataFrame({**trip_rows, "Doc Type": "Offloading", "Ton Reg": np.round(loaded * rng.uniform(0.98, 1.0, size=loaded.size), 2)}),
+        pd.DataFrame({
+            "Date": days[day_idx[fuel]], "TruckID": truck_ids[truck_idx[fuel]], "Route Code": route_ids[route_idx[fuel]],
+            "Doc Type": "Fuel",
+            # Litres for the route at 1.8-2.6 km/L
+            "Ton Reg": np.round(route_km[route_idx[fuel]] / rng.uniform(1.8, 2.6, size=fuel.sum()), 1)
+        })
+    ]).sort_values(["Date", "TruckID"], kind="stable").reset_index(drop=True)
+
+    active = trip | fuel
+    distance = np.where(trip, route_km[route_idx] * rng.uniform(0.95, 1.1, size=trip.size), rng.uniform(20, 150, size=trip.size))
+    tracker = pd.DataFrame({
+        "Date": days[day_idx[active]],
+        "TruckID": truck_ids[truck_idx[active]],
+        "Distance (km)": np.round(distance[active], 1)
+    })
+
+    driven = np.bincount(truck_idx[active], weights=distance[active], minlength=trucks)
+    current = np.round(rng.integers(50_000, 400_000, size=trucks) + driven).astype(np.int64)
+    truck_pak = pd.DataFrame({
+        "TruckID": truck_ids,
+        "Driver Name": [f"Driver {i}" for i in range(trucks)],
+        "Current Mileage": current,
+        "Last Service Mileage": current - rng.integers(0, 14_000, size=trucks),
+        "Vehicle License Expiry": today + pd.to_timedelta(rng.integers(-10, 365, size=trucks), unit="D"),
+        "Driver License Expiry": today + pd.to_timedelta(rng.integers(-10, 730, size=trucks), unit="D"),
+        "GIT Insurance Expiry": today + pd.to_timedelta(rng.integers(-10, 365, size=trucks), unit="D")
+    })
+
+    vcs = pd.DataFrame({
+        "TruckID": truck_ids,
+        "Fuel Cost (R/km)": np.round(rng.uniform(8.5, 11.0, size=trucks), 2),
+        "Maintenance Cost (R/km)": np.round(rng.uniform(0.9, 1.6, size=trucks), 2),
+        "Tyres (R/km)": np.round(rng.uniform(0.6, 1.0, size=trucks), 2),
+        "Daily Fixed Cost (R/day)": np.round(rng.uniform(1200, 1800, size=trucks), -1)
+    })
+    return operations, tracker, loi, truck_pak, vcs
+
+
+def write_demo(tables, directory="data"):
+    """Write tables as ``demo_<name>.csv``, the files demo mode reads."""
+    os.makedirs(directory, exist_ok=True)
+    paths = []
+    for name, df in zip(TABLE_NAMES, tables):
+        path = os.path.join(directory, f"demo_{name}.csv")
+        df.to_csv(path, index=False, date_format="%Y-%m-%d")
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate synthetic PrimeTower source tables.")
+    parser.add_argument("--scale", choices=SCALES, help="named fleet size; overrides --trucks/--months")
+    parser.add_argument("--trucks", type=int, default=10)
+    parser.add_argument("--months", type=int, default=3)
+    parser.add_argument("--routes", type=int, help="default: a quarter of the trucks, at least 5")
+    parser.add_argument("--start", default="2024-01-01")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="data")
+    args = parser.parse_args(argv)
+
+    trucks, months = SCALES[args.scale] if args.scale else (args.trucks, args.months)
+    tables = generate_fleet(trucks, months, args.routes, args.start, seed=args.seed)
+    for path, df in zip(write_demo(tables, args.out), tables):
+        print(f"{path}: {len(df):,} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Server-side downsampling for long time series.
+
+A daily series over several years has more points than a chart can
+show; sending all of them (with spline smoothing) makes the browser do
+the work. ``downsample`` reduces a series to a fixed point budget with
+either Largest-Triangle-Three-Buckets, which keeps the visual shape, or
+per-bucket min/max, which keeps every extreme.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Points sent to the browser per series
+MAX_POINTS = 1500
+# Above this many rendered points use WebGL (Scattergl) traces
+WEBGL_THRESHOLD = 1000
+# Markers and spline smoothing only for short series (about a quarter of days)
+SMOOTH_MAX_POINTS = 120
+
+
+def _as_float(values):
+    values = np.asarray(values)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[ns]").astype(np.int64).astype(np.float64)
+    return values.astype(np.float64)
+
+
+def lttb_indices(x, y, threshold):
+    """Positions of the points Largest-Triangle-Three-Buckets keeps."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x, y = _as_float(x), _as_float(y)
+
+    # Inner points split into threshold - 2 buckets; first and last points are always kept
+    edges = (np.floor(np.arange(threshold - 1) * (n - 2) / (threshold - 2)) + 1).astype(np.intp)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / counts
+    avg_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / counts
+    # Each bucket is scored against the next bucket's average; the last against the final point
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        area = np.abs((x[a] - next_x[i]) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (next_y[i] - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(x, y, threshold):
+    """Positions of each bucket's minimum and maximum, in order."""
+    n = len(x)
+    if threshold >= n or threshold < 2:
+        return np.arange(n)
+    buckets = np.arange(n) * (threshold // 2) // n
+    values = pd.Series(_as_float(y))
+    grouped = values.groupby(buckets)
+    return np.unique(np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy()]))
+
+
+def downsample(df, x, y, max_points=MAX_POINTS, method="lttb"):
+    """
+    Return ``df`` sorted by ``x`` and reduced to at most ``max_points`` rows.
+
+    Missing ``y`` values are dropped first. ``method`` is ``"lttb"`` or
+    ``"minmax"``.
+    """
+    series = df.dropna(subset=[y]).sort_values(x)
+    if len(series) <= max_points:
+        return series.reset_index(drop=True)
+    pick = lttb_indices if method == "lttb" else minmax_indices
+    return series.iloc[pick(series[x].to_numpy(), series[y].to_numpy(), max_points)].reset_index(drop=True)
@@ -8,12 +8,20 @@ setup(
     author="Your Name",
     author_email="your.email@example.com",
     url="https://github.com/yourusername/prime_tower",
-    packages=[],
+    packages=["prime_tower"],
+    entry_points={
+        "console_scripts": [
+            "primetower-batch=prime_tower.batch:main",
+            "primetower-gps=prime_tower.gps:main"
+        ]
+    },
     install_requires=[
         # Core Data & Math
         "numpy>=1.26.0",
         "pandas>=2.1.0",
         "scipy>=1.11.0",
+        "statsmodels>=0.14.0",
+        "pyarrow>=14.0.0",
         
         # Visualization
         "matplotlib>=3.8.0",
@@ -0,0 +1,19 @@
+"""
+Dashboard pages.
+
+Each page module declares the datasets it reads (``DATASETS``), whether
+it is driven by the month / truck / route filters (``USES_FILTERS``) and
+a ``render(ctx)`` function. Only the selected page is rendered, so only
+its datasets are ever materialized.
+"""
+
+from tabs import alerts, financials, fuel, home, maintenance, operations
+
+PAGES = {
+    "Home": home,
+    "Financials": financials,
+    "Operations": operations,
+    "Fuel": fuel,
+    "Maintenance": maintenance,
+    "Alerts": alerts
+}
@@ -0,0 +1,277 @@
+"""
+Alerts page: top performers, optimization opportunities, pricing
+recommendations and the pricing what-if simulator.
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+
+from prime_tower import alerts, pricing, rules
+from tabs.common import ACCENT_GOLD, ACCENT_TEAL, SECONDARY_NAVY, apply_chart_style, render_chart
+
+DATASETS = ("alerts", "pricing_basis")
+USES_FILTERS = True
+
+
+# Table cells are built column-wise from the ranking frames, never row by row
+def bold_cell(values):
+    return "<td style='padding: 8px 0;'><strong>" + values.astype(str) + "</strong></td>"
+
+
+def text_cell(values):
+    return "<td style='padding: 8px 0;'>" + values.astype(str) + "</td>"
+
+
+def alert_cell(values):
+    return "<td style='padding: 8px 0; text-align: right; color: #ff5252;'>" + values.astype(str) + "</td>"
+
+
+def table_rows(*cells):
+    rows = "<tr style='border-bottom: 1px solid #333;'>" + cells[0]
+    for cell in cells[1:]:
+        rows = rows + cell
+    return (rows + "</tr>").str.cat()
+
+
+def render(ctx):
+    st.markdown("Actionable recommendations to optimize fleet performance")
+
+    # Every ranking comes precomputed from the alerts engine
+    try:
+        results = ctx["alerts"]
+    except Exception as e:
+        st.error(f"Error preparing data for analysis: {str(e)}")
+        results = alerts.evaluate_alerts(pd.DataFrame(), pd.DataFrame())
+    has_cost_data = not results["top_route"].empty
+
+    # Top Performers Section
+    with st.container():
+        st.markdown(f"""
+            <div style='text-align: center; margin-bottom: 20px;'>
+                <h2 style='color: {ACCENT_GOLD}; border-bottom: 2px solid {ACCENT_TEAL}; 
+                    display: inline-block; padding-bottom: 5px;'>🏆 Performance Dashboard</h2>
+            </div>
+        """, unsafe_allow_html=True)
+
+        # Top Performers Row
+        st.markdown("### 🌟 Top Performers")
+        col1, col2 = st.columns(2)
+
+        # Most Profitable Truck Card
+        with col1:
+            try:
+                if has_cost_data:
+                    profitable_truck = results["top_truck"]
+                    if not profitable_truck.empty:
+                        truck = profitable_truck.iloc[0]
+                        st.markdown(f"""
+                            <div style='background-color: {SECONDARY_NAVY}; padding: 20px; 
+                                border-radius: 12px; border-left: 5px solid {ACCENT_TEAL};
+                                box-shadow: 0 4px 8px rgba(0,0,0,0.1); height: 100%;'>
+                                <div style='display: flex; align-items: center; gap: 15px; margin-bottom: 15px;'>
+                                    <div style='background: {ACCENT_GOLD}; width: 50px; height: 50px; 
+                                        border-radius: 50%; display: flex; align-items: center; justify-content: center;'>
+                                        <span style='font-size: 24px;'>🚛</span>
+                                    </div>
+                                    <h4 style='color: {ACCENT_GOLD}; margin: 0;'>Most Profitable Truck</h4>
+                                </div>
+                                <p style='font-size: 16px; margin-bottom: 5px; color: #e0e0e0;'>Truck ID</p>
+                                <p style='font-size: 20px; margin-top: 0; margin-bottom: 15px;'><strong>{truck['TruckID']}</strong></p>
+                                <p style='font-size: 16px; margin-bottom: 5px; color: #e0e0e0;'>Driver</p>
+                                <p style='font-size: 18px; margin-top: 0; margin-bottom: 20px;'>{truck['Driver Name']}</p>
+                                <p style='font-size: 16px; margin-bottom: 5px; color: #e0e0e0;'>Total Profit</p>
+                                <p style='font-size: 28px; color: {ACCENT_TEAL}; margin: 0; font-weight: bold;'>R{truck['Profit (R)']:,.2f}</p>
+                            </div>
+                        """, unsafe_allow_html=True)
+                else:
+                    st.warning("No cost data available for analysis")
+            except Exception as e:
+                st.error(f"Error calculating profitable truck: {str(e)}")
+
+        # Most Efficient Route Card
+        with col2:
+            try:
+                if has_cost_data:
+                    efficient_route = results["top_route"]
+                    if not efficient_route.empty:
+                        route = efficient_route.iloc[0]
+                        st.markdown(f"""
+                            <div style='background-color: {SECONDARY_NAVY}; padding: 20px; 
+                                border-radius: 12px; border-left: 5px solid {ACCENT_TEAL};
+                                box-shadow: 0 4px 8px rgba(0,0,0,0.1); height: 100%;'>
+                                <div style='display: flex; align-items: center; gap: 15px; margin-bottom: 15px;'>
+                                    <div style='background: {ACCENT_GOLD}; width: 50px; height: 50px; 
+                                        border-radius: 50%; display: flex; align-items: center; justify-content: center;'>
+                                        <span style='font-size: 24px;'>🛣️</span>
+                                    </div>
+                                    <h4 style='color: {ACCENT_GOLD}; margin: 0;'>Most Profitable Route</h4>
+                                </div>
+                                <p style='font-size: 16px; margin-bottom: 5px; color: #e0e0e0;'>Route Code</p>
+                                <p style='font-size: 20px; margin-top: 0; margin-bottom: 20px;'><strong>{route['Route Code']}</strong></p>
+                                <p style='font-size: 16px; margin-bottom: 5px; color: #e0e0e0;'>Average Profit</p>
+                                <p style='font-size: 28px; color: {ACCENT_TEAL}; margin: 0; font-weight: bold;'>R{route['Profit (R)']:,.2f}</p>
+                            </div>
+                        """, unsafe_allow_html=True)
+                else:
+                    st.warning("No route data available for analysis")
+            except Exception as e:
+                st.error(f"Error calculating efficient route: {str(e)}")
+
+    # Optimization Opportunities Section
+    with st.container():
+        st.markdown("### ⚡ Optimization Opportunities")
+        col1, col2 = st.columns(2)
+
+        # Least Fuel-Efficient Trucks Card
+        with col1:
+            try:
+                inefficient_trucks = results["inefficient_trucks"]
+                if not inefficient_trucks.empty:
+                    rows_html = table_rows(
+                        bold_cell(inefficient_trucks["TruckID"]),
+                        text_cell(inefficient_trucks["Driver Name"]),
+                        alert_cell(inefficient_trucks["Fuel Efficiency (km/L)"].map("{:.2f} km/L".format))
+                    )
+                    st.markdown(f"""
+                        <div style='background-color: {SECONDARY_NAVY}; padding: 20px; 
+                            border-radius: 12px; border-left: 5px solid #d32f2f;
+                            box-shadow: 0 4px 8px rgba(0,0,0,0.1); height: 100%;'>
+                            <div style='display: flex; align-items: center; gap: 15px; margin-bottom: 15px;'>
+                                <div style='background: #d32f2f; width: 50px; height: 50px; 
+                                    border-radius: 50%; display: flex; align-items: center; justify-content: center;'>
+                                    <span style='font-size: 24px;'>⛽</span>
+                                </div>
+                                <h4 style='color: #d32f2f; margin: 0;'>Least Fuel-Efficient Trucks</h4>
+                            </div>
+                            <div style='margin-top: 20px;'>
+                                <table style='width: 100%; border-collapse: collapse;'>
+                                    <thead>
+                                        <tr style='border-bottom: 1px solid #444;'>
+                                            <th style='text-align: left; padding: 8px 0; color: #e0e0e0;'>Truck</th>
+                                            <th style='text-align: left; padding: 8px 0; color: #e0e0e0;'>Driver</th>
+                                            <th style='text-align: right; padding: 8px 0; color: #e0e0e0;'>Efficiency</th>
+                                        </tr>
+                                    </thead>
+                                    <tbody>
+                                    {rows_html}
+                                    </tbody>
+                                </table>
+                            </div>
+                        </div>
+                    """, unsafe_allow_html=True)
+                else:
+                    st.warning("No fuel efficiency data available")
+            except Exception as e:
+                st.error(f"Error calculating inefficient trucks: {str(e)}")
+
+
+        # Loss-Making Routes Card
+        with col2:
+            try:
+                if has_cost_data:
+                    loss_routes = results["loss_routes"]
+                    if not loss_routes.empty:
+                        rows_html = table_rows(
+                            bold_cell(loss_routes["Route Code"]),
+                            alert_cell(loss_routes["Profit (R)"].abs().map("R{:,.2f}".format))
+                        )
+                        st.markdown(f"""
+                            <div style='background-color: {SECONDARY_NAVY}; padding: 20px; 
+                                border-radius: 12px; border-left: 5px solid #d32f2f;
+                                box-shadow: 0 4px 8px rgba(0,0,0,0.1); height: 100%;'>
+                                <div style='display: flex; align-items: center; gap: 15px; margin-bottom: 15px;'>
+                                    <div style='background: #d32f2f; width: 50px; height: 50px; 
+                                        border-radius: 50%; display: flex; align-items: center; justify-content: center;'>
+                                        <span style='font-size: 24px;'>🔴</span>
+                                    </div>
+                                    <h4 style='color: #d32f2f; margin: 0;'>Top Loss-Making Routes</h4>
+                                </div>
+                                <div style='margin-top: 20px;'>
+                                    <table style='width: 100%; border-collapse: collapse;'>
+                                        <thead>
+                                            <tr style='border-bottom: 1px solid #444;'>
+                                                <th style='text-align: left; padding: 8px 0; color: #e0e0e0;'>Route Code</th>
+                                                <th style='text-align: right; padding: 8px 0; color: #e0e0e0;'>Total Loss</th>
+                                            </tr>
+                                        </thead>
+                                        <tbody>
+                                        {rows_html}
+                                        </tbody>
+                                    </table>
+                                </div>
+                            </div>
+                        """, unsafe_allow_html=True)
+                    else:
+                        st.success("No loss-making routes found")
+                else:
+                    st.warning("No route data available for analysis")
+            except Exception as e:
+                st.error(f"Error calculating loss routes: {str(e)}")
+
+    # Pricing Recommendations Section
+    try:
+        if has_cost_data:
+            # High-volume routes that are currently unprofitable
+            high_volume_low_profit = results["pricing"]
+
+            if not high_volume_low_profit.empty:
+                st.warning("The following high-volume routes are currently unprofitable. Consider rate adjustments:")
+                uplift = f"{rules.RATE_UPLIFT:.0%}"
+                st.markdown((
+                    "- **" + high_volume_low_profit["Route Code"].astype(str) + "**: Current rate R"
+                    + high_volume_low_profit["Rate per ton"].map("{:.2f}".format) + "/ton → Suggest R"
+                    + high_volume_low_profit["Suggested Rate"].map("{:.2f}".format) + f"/ton ({uplift} increase)"
+                ).str.cat(sep="\n"))
+            else:
+                st.success("No major pricing issues detected in high-volume routes")
+        else:
+            st.warning("No data available for pricing recommendations")
+    except Exception as e:
+        st.error(f"Error generating pricing recommendations: {str(e)}")
+
+    # Pricing What-If: every route, candidate rate and cost change in one broadcast
+    try:
+        basis = ctx["pricing_basis"]
+        if has_cost_data and not basis.empty:
+            st.markdown("### 🧮 Pricing What-If")
+            c1, c2, c3, c4, c5 = st.columns(5)
+            with c1: rate_change = st.slider("Rate change", -20, 50, int(rules.RATE_UPLIFT * 100), format="%d%%", key="whatif_rate")
+            with c2: fuel_change = st.slider("Fuel cost", -20, 50, 0, format="%+d%%", key="whatif_fuel")
+            with c3: running_change = st.slider("Maintenance & tyres", -20, 50, 0, format="%+d%%", key="whatif_running")
+            with c4: fixed_change = st.slider("Fixed cost", -20, 50, 0, format="%+d%%", key="whatif_fixed")
+            with c5: target_margin = st.slider("Target margin", 0, 60, 20, format="%d%%", key="whatif_margin")
+
+            scenarios = pricing.cost_scenarios(
+                fuel=fuel_change / 100, maintenance=running_change / 100, tyres=running_change / 100, fixed=fixed_change / 100
+            )
+            result = pricing.simulate(basis, scenarios=scenarios)
+            summary = pricing.route_summary(basis, result, multiplier=1 + rate_change / 100)
+            summary.insert(4, "Target Rate", pricing.target_rate(basis, target_margin / 100, scenarios)[0])
+            summary["Projected Margin"] = summary["Projected Margin"] * 100
+
+            st.dataframe(
+                summary, hide_index=True, use_container_width=True,
+                column_config={
+                    "Ton Reg": st.column_config.NumberColumn("Tons", format="%.0f"),
+                    **{col: st.column_config.NumberColumn(format="R%.2f")
+                       for col in ["Rate per ton", "Break-even Rate", "Target Rate", "Scenario Rate"]},
+                    **{col: st.column_config.NumberColumn(format="R%.0f") for col in ["Projected Revenue (R)", "Projected Profit (R)"]},
+                    "Projected Margin": st.column_config.NumberColumn(format="%.1f%%")
+                }
+            )
+
+            def build_profit_surface():
+                surface = pd.DataFrame(
+                    result["profit"][0], index=result["routes"].astype(str),
+                    columns=[f"{m - 1:+.0%}" for m in pricing.DEFAULT_MULTIPLIERS]
+                )
+                fig = px.imshow(
+                    surface, aspect="auto", color_continuous_scale=[(0, "#d32f2f"), (0.5, "#ffa726"), (1, ACCENT_TEAL)],
+                    labels={"x": "Rate change", "y": "Route Code", "color": "Profit (R)"}, title="Projected Profit by Rate Change"
+                )
+                return apply_chart_style(fig, "Projected Profit by Rate Change")
+
+            render_chart(ctx, "Alerts", "profit_surface", build_profit_surface, fuel_change, running_change, fixed_change)
+    except Exception as e:
+        st.error(f"Error running pricing simulation: {str(e)}")
@@ -0,0 +1,261 @@
+"""
+Shared look and feel for the dashboard pages: palette, CSS, chart theme
+and the KPI card / cached chart helpers.
+"""
+
+import functools
+import logging
+
+import pandas as pd
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+
+from prime_tower import figures, profiling, rolling, store, timeseries
+
+logger = logging.getLogger(__name__)
+
+# =============================================================================
+# CONSTANTS & CONFIGURATION
+# =============================================================================
+
+PRIMARY_BG = "#000000"
+ACCENT_TEAL = "#008080"
+ACCENT_GOLD = "#D4AF37"
+SECONDARY_NAVY = "#0A1F44"
+WHITE = "#FFFFFF"
+LIGHT_GRAY = "#F8F9FA"
+
+COLOR_MAP = {
+    "Revenue": ACCENT_GOLD,
+    "Cost": "#d32f2f",
+    "Profit": ACCENT_TEAL,
+    "Fuel": "#ffa726",
+    "Efficiency": "#26a69a",
+    "Fixed Cost": "#9c27b0",
+    "Variable Cost": "#d32f2f",
+    True: "#d32f2f",
+    False: "#2e7d32"
+}
+
+# =============================================================================
+# STYLES & THEMES
+# =============================================================================
+
+def apply_custom_styles():
+    st.markdown(f"""
+    <style>
+        @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;600&family=Poppins:wght@600;700&display=swap');
+
+        html, body, [class*="css"] {{
+            font-family: 'Inter', sans-serif;
+            background-color: {PRIMARY_BG};
+            color: {WHITE};
+        }}
+        h1, h2, h3, h4, h5, h6 {{
+            font-family: 'Poppins', sans-serif;
+            color: {WHITE};
+        }}
+        .metric-card {{
+            background-color: {SECONDARY_NAVY};
+            border-radius: 8px;
+            padding: 1rem 1.2rem;
+            margin-bottom: 1rem;
+            border-left: 4px solid {ACCENT_TEAL};
+            box-shadow: 0 2px 8px rgba(0,0,0,0.25);
+            display: flex;
+            flex-direction: column;
+            justify-content: space-between;
+            height: 110px;
+        }}
+        .metric-card h3 {{
+            font-size: 0.9rem;
+            font-weight: 600;
+            color: {LIGHT_GRAY};
+            margin: 0 0 0.2rem 0;
+            letter-spacing: .5px;
+        }}
+        .metric-card p {{
+            font-size: 1.2rem;
+            font-weight: 700;
+            color: {ACCENT_GOLD};
+            margin: 0;
+        }}
+        .metric-card .emoji {{
+            font-size: 1.2rem;
+            margin-right: 6px;
+        }}
+        .metric-card .delta {{
+            font-size: 0.75rem;
+            font-weight: 600;
+        }}
+        [data-testid="stSidebar"] {{
+            background-color: {SECONDARY_NAVY} !important;
+            border-right: 2px solid {ACCENT_TEAL};
+        }}
+        .stTabs [role="tab"] {{
+            font-family: 'Poppins', sans-serif;
+            font-size: 0.95rem;
+            color: {ACCENT_TEAL};
+            padding: 0.6rem 1rem;
+            border-radius: 8px;
+        }}
+        .stTabs [aria-selected="true"] {{
+            background-color: {ACCENT_TEAL};
+            color: {WHITE};
+        }}
+        .filter-container {{
+            background-color: {SECONDARY_NAVY};
+            border-radius: 8px;
+            padding: 1rem;
+            margin-bottom: 1.5rem;
+            border: 1px solid {ACCENT_TEAL};
+        }}
+        .filter-title {{
+            font-family: 'Poppins', sans-serif;
+            color: {ACCENT_TEAL};
+            margin-bottom: 0.5rem;
+            font-size: 1.1rem;
+            font-weight: 600;
+        }}
+        ::-webkit-scrollbar {{
+            width: 8px;
+        }}
+        ::-webkit-scrollbar-track {{
+            background: {PRIMARY_BG};
+        }}
+        ::-webkit-scrollbar-thumb {{
+            background: {ACCENT_TEAL};
+            border-radius: 4px;
+        }}
+    </style>
+    """, unsafe_allow_html=True)
+
+def configure_chart_theme():
+    pio.templates["prime_theme"] = go.layout.Template(
+        layout=go.Layout(
+            font=dict(family="Inter", size=12, color=WHITE),
+            title=dict(font=dict(size=16, family="Poppins", color=WHITE)),
+            paper_bgcolor=PRIMARY_BG,
+            plot_bgcolor=SECONDARY_NAVY,
+            margin=dict(l=40, r=20, t=50, b=40),
+            xaxis=dict(showgrid=True, gridcolor="#333333"),
+            yaxis=dict(showgrid=True, gridcolor="#333333"),
+            legend=dict(
+                orientation="h",
+                yanchor="top",
+                y=-0.25,
+                xanchor="center",
+                x=0.5,
+                font=dict(size=10, family="Inter")
+            ),
+            colorway=[ACCENT_TEAL, "#d32f2f", ACCENT_GOLD, "#ffa726", "#26a69a"]
+        )
+    )
+    pio.templates.default = "prime_theme"
+
+# =============================================================================
+# UTILITIES
+# =============================================================================
+
+def apply_chart_style(fig, title, height=400):
+    try:
+        fig.update_layout(
+            title=dict(text=title, font=dict(family="Poppins", size=16, color=WHITE)),
+            height=height,
+            margin=dict(l=40, r=20, t=50, b=40)
+        )
+        return fig
+    except Exception as e:
+        logger.error(f"Error applying chart style: {str(e)}")
+        return fig
+
+def time_series_line(df, x, y, title, max_points=timeseries.MAX_POINTS):
+    """
+    Line chart for a series of any length: downsampled on the server to
+    ``max_points``, WebGL above ``timeseries.WEBGL_THRESHOLD`` points and
+    markers/spline only for short series.
+    """
+    series = timeseries.downsample(df, x, y, max_points)
+    smooth = len(series) <= timeseries.SMOOTH_MAX_POINTS
+    return px.line(series, x=x, y=y, title=title, markers=smooth, line_shape="spline" if smooth else "linear",
+                   render_mode="webgl" if len(series) > timeseries.WEBGL_THRESHOLD else "svg")
+
+# Data versions kept per cached builder: the current one and the one still being served
+CACHED_VERSIONS = 2
+
+def cached_resource(func=None, *, max_entries=CACHED_VERSIONS):
+    """
+    ``st.cache_resource`` that reports hits and misses to the rerun profile.
+    Frames are handed out as copy-on-write views (``store.share``), so a
+    session changing its copy never changes what other sessions see.
+
+    Builders are keyed on the data version, so ``max_entries`` bounds how
+    many versions' results stay in memory; builders with several entries
+    per version (e.g. one per table) pass a multiple of ``CACHED_VERSIONS``.
+    """
+    if func is None:
+        return functools.partial(cached_resource, max_entries=max_entries)
+
+    @functools.wraps(func)
+    def build(*args, **kwargs):
+        profiling.cache_miss()
+        return func(*args, **kwargs)
+
+    cached = st.cache_resource(show_spinner=False, max_entries=max_entries)(build)
+
+    @functools.wraps(func)
+    def lookup(*args, **kwargs):
+        result = cached(*args, **kwargs)
+        profiling.cache_lookup()
+        return store.share(result)
+
+    lookup.clear = cached.clear
+    return lookup
+
+@st.cache_resource(show_spinner=False)
+def get_figure_cache():
+    return figures.FigureCache()
+
+def render_chart(ctx, tab, chart_id, build, *key_extra):
+    # build() returns a styled Figure and only runs on a cache miss, so put the chart's data work inside it
+    key = (tab, chart_id) + ctx.filter_key + key_extra
+
+    def profiled_build():
+        profiling.cache_miss()
+        with profiling.span("build figure"):
+            return build()
+
+    figure_cache = get_figure_cache()
+    with profiling.span(f"chart: {tab}/{chart_id}"):
+        spec = figure_cache.get_or_build(key, profiled_build)
+        profiling.cache_lookup()
+        with profiling.span("render"):
+            st.plotly_chart(pio.from_json(spec), use_container_width=True)
+
+def kpi_card(title, value, emoji=None, delta=None, delta_label="", higher_is_better=True):
+    emoji_html = f'<span class="emoji">{emoji}</span>' if emoji else ""
+    delta_html = ""
+    if delta is not None and pd.notna(delta):
+        color = COLOR_MAP[(delta < 0) == higher_is_better]
+        delta_html = f'<span class="delta" style="color: {color};">{delta:+.1%} {delta_label}</span>'
+    return f"""
+    <div class="metric-card">
+        <h3>{emoji_html}{title}</h3>
+        <p>{value}</p>
+        {delta_html}
+    </div>
+    """
+
+def period_deltas(ctx):
+    """
+    Change of each rolling KPI against the window of the same length just
+    before the selected range, plus the label for the cards.
+    """
+    current, previous = ctx["rolling"].range_change(ctx.months, ctx.truck, ctx.route)
+    length = len(ctx.months)
+    label = "vs prev month" if length == 1 else f"vs prev {length} months"
+    if current is None or previous is None:
+        return {}, label
+    return {measure: rolling.change(current[measure], previous[measure]) for measure in current}, label
@@ -0,0 +1,205 @@
+"""
+Lazily materialized datasets for the dashboard pages.
+
+Pages declare the datasets they need in ``DATASETS``; ``PageContext``
+builds only those (plus whatever they are derived from) on first access.
+Builders that outlive a rerun are cached per data version (the current
+one and the one still being served, see ``CACHED_VERSIONS``) and shared
+across sessions as copy-on-write views; filtered views live in the
+process-wide ``SharedStore``, keyed by dataset, filter and data version.
+"""
+
+import logging
+
+import pandas as pd
+import streamlit as st
+
+from prime_tower import (
+    alerts, config, cube, filters, forecast, fuel, model, pricing, profiling, rolling, rules, service, store
+)
+from tabs.common import CACHED_VERSIONS, cached_resource
+
+logger = logging.getLogger(__name__)
+
+SOURCE_TABLES = ("operations_raw", "tracker", "loi", "truck_pak", "vcs")
+
+# Tables served through a FilterIndex (see _apply_filters)
+FILTERED_TABLES = ("operations", "trip_facts", "fuel_ledger", "monthly_cube")
+
+
+@cached_resource
+def get_prepared_operations(data_version, _operations):
+    logger.info(f"Preparing operations for data version {data_version}")
+    return model.prepare_operations(_operations)
+
+
+@cached_resource
+def get_trip_facts(data_version, _operations, _tracker, _loi, _truck_pak, _vcs):
+    # Built once per data version and shared; the underscored frames are not hashed
+    logger.info(f"Building trip facts for data version {data_version}")
+    return model.build_trip_facts(_operations, _tracker, _loi, _truck_pak, _vcs)
+
+
+@cached_resource
+def get_monthly_cube(data_version, _trip_facts, _loi):
+    logger.info(f"Building monthly cube for data version {data_version}")
+    return cube.build_monthly_cube(_trip_facts, _loi)
+
+
+@cached_resource(max_entries=CACHED_VERSIONS * len(FILTERED_TABLES))
+def get_filter_index(data_version, table_name, _df):
+    logger.info(f"Building {table_name} filter index for data version {data_version}")
+    return filters.FilterIndex(_df)
+
+
+@cached_resource
+def get_fuel_ledger(data_version, _operations, _tracker, _truck_pak, _loi):
+    # Fill-to-fill over the whole history; the Fuel page and fuel alerts slice this one ledger
+    logger.info(f"Building fuel ledger for data version {data_version}")
+    return fuel.build_fuel_ledger(_operations, _tracker, _truck_pak, _loi)
+
+
+@cached_resource
+def get_monthly_alerts(data_version, _trip_facts, _fuel_ledger):
+    # Batch mode: every month's rankings in one set of grouped passes
+    logger.info(f"Evaluating alerts for all months, data version {data_version}")
+    return alerts.evaluate_alerts(_trip_facts, _fuel_ledger, by=["Year-Month"])
+
+
+@cached_resource
+def get_truck_alerts(data_version, today, _truck_pak):
+    # Days left change daily, so the day is part of the key
+    logger.info(f"Evaluating truck rules for data version {data_version}")
+    return rules.evaluate_rules(rules.truck_status(_truck_pak, today), "trucks")
+
+
+@cached_resource
+def get_service_projection(data_version, today, _operations, _tracker, _loi, _truck_pak):
+    # Projected from today's mileage, so the day is part of the key
+    logger.info(f"Projecting service dates for data version {data_version}")
+    rates = service.daily_km_rates(_operations, _tracker, _loi)
+    return service.project_services(_truck_pak, rates, today)
+
+
+@st.cache_resource(show_spinner=False)
+def get_rolling_history():
+    # Latest aggregates of any version; seeds the next version's prefix sums
+    return {}
+
+
+@cached_resource
+def get_rolling_aggregates(data_version, _month_cube, months):
+    logger.info(f"Building rolling aggregates for data version {data_version}")
+    history = get_rolling_history()
+    aggregates = rolling.RollingAggregates(rolling.monthly_totals(_month_cube), months, previous=history.get("latest"))
+    history["latest"] = aggregates
+    return aggregates
+
+
+@st.cache_resource(show_spinner=False)
+def get_forecast_history():
+    # Latest fitted forecasts of any version; the next version refits only changed series
+    return {}
+
+
+@cached_resource
+def get_forecasts(data_version, _operations):
+    logger.info(f"Fitting tonnage forecasts for data version {data_version}")
+    history = get_forecast_history()
+    forecasts = forecast.fit_forecasts(_operations, previous=history.get("latest"))
+    history["latest"] = forecasts
+    return forecasts
+
+
+@st.cache_resource(show_spinner=False)
+def get_shared_store():
+    return store.SharedStore(max_bytes=config.SHARED_STORE_MB * 1024 * 1024)
+
+
+def _shared(ctx, name, compute):
+    # One copy and one computation per (dataset, filter, data version) across all sessions
+    return get_shared_store().get_or_compute((name,) + ctx.filter_key, compute)
+
+
+def _apply_filters(ctx, table_name, df):
+    index = get_filter_index(ctx.data_version, table_name, df)
+    return _shared(ctx, table_name, lambda: index.apply(ctx.months, ctx.truck, ctx.route))
+
+
+def _trip_facts(ctx):
+    return get_trip_facts(
+        ctx.data_version, ctx.build("operations"), ctx.build("tracker"),
+        ctx.build("loi"), ctx.build("truck_pak"), ctx.build("vcs")
+    )
+
+
+def _alerts(ctx):
+    if len(ctx.months) == 1 and ctx.truck == "All" and ctx.route == "All":
+        return _shared(ctx, "alerts", lambda: alerts.slice_alerts(
+            get_monthly_alerts(ctx.data_version, ctx.build("trip_facts"), ctx.build("fuel_ledger")), ctx.month
+        ))
+    return _shared(ctx, "alerts", lambda: alerts.evaluate_alerts(
+        ctx.build("filtered_facts"), ctx.build("filtered_fuel")
+    ))
+
+
+PROVIDERS = {
+    "operations": lambda ctx: get_prepared_operations(ctx.data_version, ctx.build("operations_raw"))[0],
+    "month_dict": lambda ctx: get_prepared_operations(ctx.data_version, ctx.build("operations_raw"))[1],
+    "filtered_ops": lambda ctx: _apply_filters(ctx, "operations", ctx.build("operations")),
+    "trip_facts": _trip_facts,
+    "filtered_facts": lambda ctx: _apply_filters(ctx, "trip_facts", ctx.build("trip_facts")),
+    "fuel_ledger": lambda ctx: get_fuel_ledger(
+        ctx.data_version, ctx.build("operations"), ctx.build("tracker"), ctx.build("truck_pak"), ctx.build("loi")
+    ),
+    "filtered_fuel": lambda ctx: _apply_filters(ctx, "fuel_ledger", ctx.build("fuel_ledger")),
+    "alerts": _alerts,
+    "pricing_basis": lambda ctx: _shared(ctx, "pricing_basis", lambda: pricing.route_basis(ctx.build("filtered_facts"))),
+    "truck_alerts": lambda ctx: get_truck_alerts(ctx.data_version, pd.Timestamp.today().normalize(), ctx.build("truck_pak")),
+    "service_projection": lambda ctx: get_service_projection(
+        ctx.data_version, pd.Timestamp.today().normalize(), ctx.build("operations"),
+        ctx.build("tracker"), ctx.build("loi"), ctx.build("truck_pak")
+    ),
+    "cube": lambda ctx: get_monthly_cube(ctx.data_version, ctx.build("trip_facts"), ctx.build("loi")),
+    "month_cube": lambda ctx: _apply_filters(ctx, "monthly_cube", ctx.build("cube")),
+    "forecasts": lambda ctx: get_forecasts(ctx.data_version, ctx.build("operations")),
+    "rolling": lambda ctx: get_rolling_aggregates(ctx.data_version, ctx.build("cube"), tuple(ctx.build("month_dict").values()))
+}
+
+
+class PageContext:
+    """
+    Per-rerun view of the data for one page.
+
+    ``ctx["name"]`` materializes a declared dataset on first use; asking
+    for an undeclared one raises ``KeyError`` so page declarations stay
+    honest.
+    """
+
+    def __init__(self, tables, data_version, declared=(), months=(), truck="All", route="All"):
+        self.data_version = data_version
+        self.months = tuple(months)
+        self.truck = truck
+        self.route = route
+        self.declared = frozenset(declared)
+        self._values = dict(zip(SOURCE_TABLES, tables))
+
+    @property
+    def month(self):
+        """Last month of the selected range."""
+        return self.months[-1] if self.months else None
+
+    @property
+    def filter_key(self):
+        return (self.months, self.truck, self.route, self.data_version)
+
+    def build(self, name):
+        if name not in self._values:
+            with profiling.span(f"dataset: {name}"):
+                self._values[name] = PROVIDERS[name](self)
+        return self._values[name]
+
+    def __getitem__(self, name):
+        if name not in self.declared:
+            raise KeyError(f"Dataset '{name}' is not declared by this page")
+        return self.build(name)
@@ -0,0 +1,89 @@
+"""
+Financials page: revenue, cost and profit by truck and route.
+"""
+
+import streamlit as st
+import plotly.express as px
+
+from prime_tower import cube
+from tabs.common import ACCENT_TEAL, COLOR_MAP, WHITE, apply_chart_style, kpi_card, period_deltas, render_chart
+
+DATASETS = ("month_cube", "rolling")
+USES_FILTERS = True
+
+
+def render(ctx):
+    st.markdown(f"<h4 style='color: {ACCENT_TEAL};'>Financials Overview</h4>", unsafe_allow_html=True)
+    try:
+        month_cube = ctx["month_cube"]
+
+        kpis = cube.financial_kpis(month_cube)
+        total_revenue = kpis["total_revenue"]
+        total_cost = kpis["total_cost"]
+        avg_cost_per_km = kpis["avg_cost_per_km"]
+        profit_margin = kpis["profit_margin"]
+
+        deltas, delta_label = period_deltas(ctx)
+
+        c1, c2, c3, c4 = st.columns(4)
+        with c1: st.markdown(kpi_card("Total Revenue", f"R{total_revenue:,.2f}", emoji="💰",
+                                      delta=deltas.get("Revenue (R)"), delta_label=delta_label), unsafe_allow_html=True)
+        with c2: st.markdown(kpi_card("Total Cost", f"R{total_cost:,.2f}", emoji="📉",
+                                      delta=deltas.get("Total Cost (R)"), delta_label=delta_label, higher_is_better=False), unsafe_allow_html=True)
+        with c3: st.markdown(kpi_card("Avg Cost/km", f"R{avg_cost_per_km:,.2f}", emoji="🛣️",
+                                      delta=deltas.get("Avg Cost/km (R)"), delta_label=delta_label, higher_is_better=False), unsafe_allow_html=True)
+        with c4: st.markdown(kpi_card("Profit Margin", f"{profit_margin:.1%}", emoji="📈",
+                                      delta=deltas.get("Profit Margin"), delta_label=delta_label), unsafe_allow_html=True)
+
+        first_date, last_date = cube.date_range(month_cube)
+        st.caption(f"Data from {first_date.date()} to {last_date.date()}")
+
+        def build_cost_structure():
+            grouped_cost = cube.truck_costs(month_cube)
+            df_plot = grouped_cost[["TruckID", "Variable Cost (R)", "Daily Fixed Cost (R/day)"]].melt(id_vars="TruckID", var_name="Cost Type", value_name="Cost (R)")
+            fig = px.bar(df_plot, x="TruckID", y="Cost (R)", color="Cost Type", barmode="stack", title="Cost Structure by Truck", color_discrete_map=COLOR_MAP)
+            return apply_chart_style(fig, "Cost Structure by Truck")
+
+        def build_truck_profit():
+            grouped_cost = cube.truck_costs(month_cube)
+            fig2 = px.bar(grouped_cost, x="TruckID", y="Profit (R)", color="Profit (R)", color_continuous_scale=[(0, "#d32f2f"), (1, ACCENT_TEAL)], title="Profit by Truck")
+            return apply_chart_style(fig2, "Profit by Truck")
+
+        def build_route_profitability():
+            route_profit = cube.route_profit(month_cube)
+            fig3 = px.scatter(route_profit, x="Revenue (R)", y="Total Cost (R)", size="Ton Reg", color="Profit (R)", hover_name="Route Code",
+                              title="Route Profitability (Bubble Size = Total Tons)", color_continuous_scale=[(0, "#d32f2f"), (1, ACCENT_TEAL)], size_max=40)
+            max_val = route_profit[["Revenue (R)", "Total Cost (R)"]].max().max() * 1.1
+            fig3.add_shape(type="line", x0=0, y0=0, x1=max_val, y1=max_val, line=dict(dash="dash", color=WHITE))
+            return apply_chart_style(fig3, "Route Profitability")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            render_chart(ctx, "Financials", "cost_structure", build_cost_structure)
+
+        with c2:
+            render_chart(ctx, "Financials", "truck_profit", build_truck_profit)
+
+        # Route profitability scatter
+        render_chart(ctx, "Financials", "route_profitability", build_route_profitability)
+
+        # Month-over-month and rolling windows ending at the last selected month
+        st.markdown(f"<h5 style='color: {ACCENT_TEAL};'>Period Comparison</h5>", unsafe_allow_html=True)
+        comparison = ctx["rolling"].comparison(ctx.months, ctx.truck, ctx.route)
+        change_columns = ["Revenue (R) change", "Profit (R) change", "Tons change"]
+        comparison[change_columns] = comparison[change_columns] * 100
+        comparison["Profit Margin"] = comparison["Profit Margin"] * 100
+        st.dataframe(
+            comparison.drop(columns=["Trips"]), hide_index=True, use_container_width=True,
+            column_config={
+                **{col: st.column_config.NumberColumn(format="R%.0f") for col in ["Revenue (R)", "Total Cost (R)", "Profit (R)"]},
+                "Profit Margin": st.column_config.NumberColumn(format="%.1f%%"),
+                "Avg Cost/km (R)": st.column_config.NumberColumn(format="R%.2f"),
+                "Tons": st.column_config.NumberColumn(format="%.1f"),
+                "Distance (km)": st.column_config.NumberColumn(format="%.0f"),
+                **{col: st.column_config.NumberColumn(format="%+.1f%%") for col in change_columns}
+            }
+        )
+
+    except Exception as e:
+        st.error(f"Error in Financials tab: {str(e)}")
@@ -0,0 +1,56 @@
+"""
+Fuel page: fuel efficiency per day and per truck.
+"""
+
+import streamlit as st
+import plotly.express as px
+
+from prime_tower import fuel
+from tabs.common import ACCENT_GOLD, ACCENT_TEAL, apply_chart_style, kpi_card, render_chart, time_series_line
+
+DATASETS = ("filtered_fuel",)
+USES_FILTERS = True
+
+
+def render(ctx):
+    st.markdown(f"<h4 style='color: {ACCENT_TEAL};'>Fuel Efficiency Dashboard</h4>", unsafe_allow_html=True)
+    try:
+        fuel_df = ctx["filtered_fuel"]
+        if fuel_df.empty:
+            st.info("No fuel slips for the selected filters.")
+            return
+        kpis = fuel.fleet_kpis(fuel_df)
+        avg_efficiency = kpis["avg_efficiency"]
+
+        c1, c2, c3, c4 = st.columns(4)
+        with c1: st.markdown(kpi_card("Avg Efficiency", f"{avg_efficiency:.2f} km/L", emoji="🚀"), unsafe_allow_html=True)
+        with c2: st.markdown(kpi_card("Total Fuel", f"{kpis['total_fuel']:,.1f} L", emoji="⛽"), unsafe_allow_html=True)
+        with c3: st.markdown(kpi_card("Fuel Used/km", f"{kpis['litres_per_km']:.3f} L", emoji="💸"), unsafe_allow_html=True)
+        with c4: st.markdown(kpi_card("Best Truck", f"{kpis['best_truck_efficiency']:.2f} km/L", emoji="🏆"), unsafe_allow_html=True)
+
+        st.caption(
+            f"Fill-to-fill from {fuel_df['Date'].min().date()} to {fuel_df['Date'].max().date()}; "
+            "distance from the tracker odometer, route distance where a truck has no tracker data"
+        )
+
+        def build_daily_efficiency():
+            daily_eff = fuel.efficiency(fuel_df, ["Date_only"])
+            fig1 = time_series_line(daily_eff, "Date_only", "Fuel Efficiency (km/L)", "Daily Fuel Efficiency")
+            fig1.update_traces(line_color=ACCENT_TEAL)
+            fig1.add_hline(y=avg_efficiency, line_dash="dash", line_color=ACCENT_GOLD, annotation_text=f"Avg: {avg_efficiency:.2f} km/L")
+            return apply_chart_style(fig1, "Daily Fuel Efficiency")
+
+        def build_truck_efficiency():
+            truck_eff = fuel.efficiency(fuel_df, ["TruckID", "Driver Name"])
+            fig2 = px.bar(truck_eff, x="TruckID", y="Fuel Efficiency (km/L)", color="Fuel Efficiency (km/L)", hover_name="Driver Name",
+                          title="Fuel Efficiency by Truck", color_continuous_scale=[(0, "#d32f2f"), (0.5, "#ffa726"), (1, ACCENT_TEAL)])
+            return apply_chart_style(fig2, "Fuel Efficiency by Truck")
+
+        c1, c2 = st.columns(2)
+        with c1:
+            render_chart(ctx, "Fuel", "daily_efficiency", build_daily_efficiency)
+
+        with c2:
+            render_chart(ctx, "Fuel", "truck_efficiency", build_truck_efficiency)
+    except Exception as e:
+        st.error(f"Error in Fuel tab: {str(e)}")
@@ -0,0 +1,38 @@
+"""
+Home page: fleet welcome banner and headline cards.
+"""
+
+from datetime import datetime
+
+import streamlit as st
+
+from tabs.common import ACCENT_TEAL, LIGHT_GRAY, kpi_card
+
+DATASETS = ()
+USES_FILTERS = False
+
+
+def render(ctx):
+    st.markdown(f"""
+        <div style='text-align: center; margin-bottom: 2rem;'>
+            <h1 style='color: {ACCENT_TEAL}; margin-bottom: 0;'>
+                <span style='font-size: 1.5em;'>🚛</span> Welcome to PrimeTower
+            </h1>
+            <p style='font-size: 1.1rem; color: {LIGHT_GRAY};'>
+                Your fleet at a glance • Last updated: {datetime.now().strftime("%d %b %Y %H:%M")}
+            </p>
+        </div>
+    """, unsafe_allow_html=True)
+
+    c1, c2, c3 = st.columns(3)
+    with c1:
+        st.markdown(kpi_card("Active Trucks", "12", emoji="🚚"), unsafe_allow_html=True)
+        st.markdown(kpi_card("Today's Trips", "24", emoji="🛣️"), unsafe_allow_html=True)
+    with c2:
+        st.markdown(kpi_card("Fuel Efficiency", "3.2 km/L", emoji="⛽"), unsafe_allow_html=True)
+        st.markdown(kpi_card("Avg Load", "18.5T", emoji="📦"), unsafe_allow_html=True)
+    with c3:
+        st.markdown(kpi_card("Today's Revenue", "R42,380", emoji="💰"), unsafe_allow_html=True)
+        st.markdown(kpi_card("Alerts", "2", emoji="⚠️"), unsafe_allow_html=True)
+
+    # … (remainder of Home tab code unchanged)
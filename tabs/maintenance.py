@@ -0,0 +1,108 @@
+"""
+Maintenance page: service intervals, projected services and licence /
+insurance expiry.
+"""
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from prime_tower import service
+from prime_tower.rules import EXPIRY_FIELDS, EXPIRY_WINDOW_DAYS, SERVICE_INTERVAL_KM
+from tabs.common import ACCENT_GOLD, ACCENT_TEAL, COLOR_MAP, apply_chart_style, kpi_card, render_chart
+
+DATASETS = ("truck_alerts", "service_projection")
+USES_FILTERS = False
+
+
+def render(ctx):
+    st.markdown(f"<h4 style='color: {ACCENT_TEAL};'>Maintenance Dashboard</h4>", unsafe_allow_html=True)
+    try:
+        # Service and expiry flags come from the rule registry, evaluated once per data version and day
+        maint_df = ctx["truck_alerts"]
+        today = pd.to_datetime("today").normalize()
+
+        overdue_services = maint_df["Service Due"].sum()
+        license_expiring = maint_df["License Expiry Expiring"].sum()
+        driver_expiring = maint_df["Driver License Expiring"].sum()
+        git_expiring = maint_df["GIT Insurance Expiring"].sum()
+
+        c1, c2, c3, c4 = st.columns(4)
+        with c1: st.markdown(kpi_card("Due Services", int(overdue_services), emoji="🔧"), unsafe_allow_html=True)
+        with c2: st.markdown(kpi_card("License Expiry", license_expiring, emoji="📝"), unsafe_allow_html=True)
+        with c3: st.markdown(kpi_card("Driver License", driver_expiring, emoji="👤"), unsafe_allow_html=True)
+        with c4: st.markdown(kpi_card("Insurance", git_expiring, emoji="🛡️"), unsafe_allow_html=True)
+
+        c1, c2 = st.columns(2)
+        with c1:
+            def build_km_since_service():
+                fig1 = px.bar(maint_df.sort_values("KM Since Service", ascending=False), x="TruckID", y="KM Since Service",
+                              color="Service Due", color_discrete_map=COLOR_MAP, title="KM Since Last Service",
+                              hover_data=["Current Mileage", "Last Service Mileage"])
+                fig1.add_hline(y=SERVICE_INTERVAL_KM, line_dash="dash", line_color=ACCENT_GOLD, annotation_text="Service Threshold")
+                return apply_chart_style(fig1, "KM Since Last Service")
+            render_chart(ctx, "Maintenance", "km_since_service", build_km_since_service)
+
+        with c2:
+            expiring_df = maint_df[maint_df["License Expiry Expiring"] | maint_df["Driver License Expiring"] | maint_df["GIT Insurance Expiring"]]
+            if not expiring_df.empty:
+                days_left = {f"{label} Days Left": col for col, label in EXPIRY_FIELDS.items()}
+
+                def build_expiry_heatmap():
+                    days_matrix = expiring_df[list(days_left)].rename(columns=days_left).clip(lower=0, upper=EXPIRY_WINDOW_DAYS)
+                    fig2 = go.Figure(go.Heatmap(
+                        z=days_matrix.values,
+                        x=days_matrix.columns,
+                        y=expiring_df["TruckID"],
+                        colorscale=[[0, "darkred"], [0.2, "orangered"], [0.5, "orange"], [0.8, "yellow"], [1, "lightyellow"]],
+                        colorbar=dict(title="Days to Expiry", tickvals=[0, 10, 20, 30], ticktext=["0 (Expired)", "10", "20", "30+"]),
+                        hovertemplate="TruckID %{y}<br>%{x}: %{z} days"
+                    ))
+                    return apply_chart_style(fig2, "Expiring Licenses & Insurance")
+                # Days-to-expiry change daily, so the day is part of the key
+                render_chart(ctx, "Maintenance", "expiry_heatmap", build_expiry_heatmap, today)
+            else:
+                st.success("✅ No licenses or insurance expiring soon.")
+    except Exception as e:
+        st.error(f"Error in Maintenance tab: {str(e)}")
+
+    # Workshop calendar: due dates projected from each truck's recent km per day
+    try:
+        projection = ctx["service_projection"]
+        today = pd.to_datetime("today").normalize()
+        st.markdown(f"<h5 style='color: {ACCENT_TEAL};'>Workshop Calendar</h5>", unsafe_allow_html=True)
+        c1, c2 = st.columns(2)
+        with c1: weeks = st.slider("Weeks ahead", 2, 26, service.HORIZON_WEEKS, key="service_weeks")
+        with c2: capacity = st.number_input("Workshop capacity (services/week)", 1, 100, 5, key="service_capacity")
+
+        calendar = service.service_calendar(projection, today, weeks)
+        load = service.weekly_load(calendar, today, weeks, capacity)
+
+        c1, c2, c3 = st.columns(3)
+        with c1: st.markdown(kpi_card("Due in 2 Weeks", int((calendar["Due Date"] < today + pd.Timedelta(days=14)).sum()), emoji="🗓️"),
+                             unsafe_allow_html=True)
+        with c2: st.markdown(kpi_card(f"Due in {weeks} Weeks", len(calendar), emoji="🔧"), unsafe_allow_html=True)
+        with c3: st.markdown(kpi_card("Weeks Over Capacity", int(load["Over Capacity"].sum()), emoji="⚠️"), unsafe_allow_html=True)
+
+        def build_weekly_load():
+            fig = px.bar(load, x="Week", y="Services", hover_data=["Trucks", "Overdue"], title="Services per Week",
+                         color="Over Capacity", color_discrete_map={False: ACCENT_TEAL, True: "#d32f2f"})
+            fig.add_hline(y=capacity, line_dash="dash", line_color=ACCENT_GOLD, annotation_text="Capacity")
+            return apply_chart_style(fig, "Services per Week")
+        render_chart(ctx, "Maintenance", "workshop_load", build_weekly_load, today, weeks, capacity)
+
+        upcoming = calendar.merge(projection[["TruckID", "Velocity Source"]], on="TruckID", how="left")
+        st.dataframe(
+            upcoming[["Due Date", "TruckID", "Driver Name", "Service", "Overdue", "Daily km", "Velocity Source"]],
+            hide_index=True, use_container_width=True,
+            column_config={
+                "Due Date": st.column_config.DateColumn(format="YYYY-MM-DD"),
+                "Daily km": st.column_config.NumberColumn(format="%.0f")
+            }
+        )
+        idle = projection[projection["Days Until Due"].isna()]
+        if not idle.empty:
+            st.caption(f"No recent distance for {', '.join(idle['TruckID'])}; not scheduled.")
+    except Exception as e:
+        st.error(f"Error building workshop calendar: {str(e)}")
@@ -0,0 +1,101 @@
+"""
+Operations page: tonnage, distance and trips per truck, and the tonnage forecast.
+"""
+
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+
+from prime_tower import cube, forecast
+from tabs.common import (
+    ACCENT_GOLD, ACCENT_TEAL, SECONDARY_NAVY, apply_chart_style, kpi_card, period_deltas, render_chart, time_series_line
+)
+
+DATASETS = ("filtered_ops", "month_cube", "rolling", "forecasts")
+USES_FILTERS = True
+
+
+def render(ctx):
+    st.markdown(f"<h4 style='color: {ACCENT_TEAL};'>Operations Dashboard</h4>", unsafe_allow_html=True)
+    try:
+        ops_df = ctx["filtered_ops"]
+        month_cube = ctx["month_cube"]
+
+        kpis = cube.operations_kpis(month_cube)
+        active_trucks = kpis["active_trucks"]
+        total_tons = kpis["total_tons"]
+        total_km = kpis["total_km"]
+        avg_tons_per_truck = kpis["avg_tons_per_truck"]
+
+        deltas, delta_label = period_deltas(ctx)
+
+        c1, c2, c3, c4 = st.columns(4)
+        with c1: st.markdown(kpi_card("Active Trucks", active_trucks, emoji="🚚"), unsafe_allow_html=True)
+        with c2: st.markdown(kpi_card("Total Tons", f"{total_tons:,.1f}", emoji="📦",
+                                      delta=deltas.get("Tons"), delta_label=delta_label), unsafe_allow_html=True)
+        with c3: st.markdown(kpi_card("Distance", f"{total_km:,.0f} km", emoji="🛣️",
+                                      delta=deltas.get("Distance (km)"), delta_label=delta_label), unsafe_allow_html=True)
+        with c4: st.markdown(kpi_card("Avg Tons/Truck", f"{avg_tons_per_truck:,.1f}", emoji="⚖️"), unsafe_allow_html=True)
+
+        st.caption(f"Data from {ops_df['Date'].min().date()} to {ops_df['Date'].max().date()}")
+
+        def build_daily_tons():
+            daily_tons = ops_df[ops_df["Doc Type"] == "Offloading"].groupby("Date_only")["Ton Reg"].sum().reset_index()
+            fig1 = time_series_line(daily_tons, "Date_only", "Ton Reg", "Daily Tons Moved")
+            fig1.update_traces(line_color=ACCENT_TEAL)
+            return apply_chart_style(fig1, "Daily Tons Moved")
+
+        def build_tons_per_truck():
+            tons_per_truck = cube.tons_per_truck(month_cube)
+            fig2 = px.bar(tons_per_truck, x="TruckID", y="Ton Reg", color="Ton Reg", hover_name="Driver Name",
+                          title="Total Tons by Truck", color_continuous_scale=[(0, SECONDARY_NAVY), (1, ACCENT_TEAL)])
+            return apply_chart_style(fig2, "Total Tons by Truck")
+
+        def build_trips_per_truck():
+            trips_per_truck = cube.trips_per_truck(month_cube)
+            fig3 = px.bar(trips_per_truck, x="TruckID", y="Trips", color="Trips", hover_name="Driver Name",
+                          title="Total Trips by Truck", color_continuous_scale=[(0, SECONDARY_NAVY), (1, ACCENT_GOLD)])
+            return apply_chart_style(fig3, "Total Trips by Truck")
+
+        render_chart(ctx, "Operations", "daily_tons", build_daily_tons)
+
+        c1, c2 = st.columns(2)
+        with c1:
+            render_chart(ctx, "Operations", "tons_per_truck", build_tons_per_truck)
+
+        with c2:
+            render_chart(ctx, "Operations", "trips_per_truck", build_trips_per_truck)
+    except Exception as e:
+        st.error(f"Error in Operations tab: {str(e)}")
+
+    # Forecast from the end of the data; follows the truck/route filter, not the month range
+    try:
+        forecasts = ctx["forecasts"]
+        if ctx.truck != "All":
+            subject, projected = f"Truck {ctx.truck}", forecasts.forecast("trucks", [str(ctx.truck)])
+        elif ctx.route != "All":
+            subject, projected = f"Route {ctx.route}", forecasts.forecast("routes", [str(ctx.route)])
+        else:
+            subject, projected = "Fleet", forecasts.forecast("routes")
+        if projected.empty:
+            return
+
+        st.markdown(f"<h5 style='color: {ACCENT_TEAL};'>Tonnage Forecast: {subject}</h5>", unsafe_allow_html=True)
+        c1, c2 = st.columns(2)
+        with c1: st.markdown(kpi_card("Next 7 Days", f"{projected['Forecast'].iloc[:7].sum():,.0f} t", emoji="🔮"), unsafe_allow_html=True)
+        with c2: st.markdown(kpi_card(f"Next {forecast.HORIZON_DAYS} Days", f"{projected['Forecast'].sum():,.0f} t", emoji="📅"),
+                             unsafe_allow_html=True)
+
+        def build_forecast():
+            fig = go.Figure([
+                go.Scatter(x=projected["Date"], y=projected["Upper"], line_width=0, showlegend=False, hoverinfo="skip"),
+                go.Scatter(x=projected["Date"], y=projected["Lower"], line_width=0, fill="tonexty", name="Likely range",
+                           fillcolor="rgba(0, 128, 128, 0.2)", hoverinfo="skip"),
+                go.Scatter(x=projected["Date"], y=projected["Forecast"], name="Forecast", line_color=ACCENT_GOLD)
+            ])
+            fig.update_layout(yaxis_title="Ton Reg")
+            return apply_chart_style(fig, f"Daily Tons Forecast: {subject}")
+
+        render_chart(ctx, "Operations", "tons_forecast", build_forecast)
+    except Exception as e:
+        st.error(f"Error forecasting tonnage: {str(e)}")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests import prime_tower and tabs from the repository root, as the dashboard does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,34 @@
+import json
+import os
+import pickle
+
+import pandas as pd
+import pytest
+
+from prime_tower import batch
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+
+@pytest.fixture(scope="module")
+def demo_tables():
+    tables, version = batch.load_tables(demo_dir=DATA_DIR)
+    return tables, version
+
+
+def test_filter_index_survives_pickling(demo_tables):
+    index = batch.prepare(demo_tables[0])["trip_facts"]
+    month = index.df["Year-Month"].dropna().iloc[0]
+    pd.testing.assert_frame_equal(pickle.loads(pickle.dumps(index)).apply(month), index.apply(month))
+
+
+def test_process_executor_matches_threads(demo_tables, tmp_path):
+    tables, version = demo_tables
+    batch.run(tables, version, str(tmp_path / "thread"), formats=("csv",), workers=2, executor="thread")
+    # Workers are spawned, so everything sent to them must pickle
+    manifest = batch.run(tables, version, str(tmp_path / "process"), formats=("csv",), workers=2, executor="process")
+    assert manifest["months"]
+    with open(tmp_path / "process" / "manifest.json") as f:
+        assert json.load(f)["tables"] == manifest["tables"]
+    pd.testing.assert_frame_equal(pd.read_csv(tmp_path / "process" / "kpis.csv"),
+                                  pd.read_csv(tmp_path / "thread" / "kpis.csv"))
@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+import pytest
+
+from prime_tower import fuel, model, schema
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+DEMO_TABLES = ("operations", "tracker", "loi", "truck_pak", "vcs")
+
+
+def _demo_tables():
+    return tuple(pd.read_csv(os.path.join(DATA_DIR, f"demo_{name}.csv")) for name in DEMO_TABLES)
+
+
+def _kpi_totals(tables):
+    operations_raw, tracker, loi, truck_pak, vcs = tables
+    operations, _ = model.prepare_operations(operations_raw)
+    facts = model.build_trip_facts(operations, tracker, loi, truck_pak, vcs)
+    ledger = fuel.build_fuel_ledger(operations, tracker, truck_pak, loi)
+    totals = facts[["Ton Reg", "Distance (km)", "Revenue (R)", "Variable Cost (R)", "Total Cost (R)", "Profit (R)"]].sum()
+    totals["Litres"] = ledger["Litres"].sum()
+    totals["Fuel Distance (km)"] = ledger["Distance (km)"].sum()
+    return totals
+
+
+def test_measures_stay_float64():
+    compact, _ = schema.apply_schemas(_demo_tables())
+    for name, df in zip(schema.TABLE_ORDER, compact):
+        for col, kind in schema.SCHEMAS[name].items():
+            if kind == schema.FLOAT and col in df.columns:
+                assert df[col].dtype == "float64", f"{name}.{col}"
+
+
+def test_kpi_totals_unchanged_by_schemas():
+    raw = _kpi_totals(_demo_tables())
+    compact = _kpi_totals(schema.apply_schemas(_demo_tables())[0])
+    pd.testing.assert_series_equal(compact, raw, check_exact=True)
+    assert compact["Revenue (R)"] == pytest.approx(60_768_412.70, abs=0.005)
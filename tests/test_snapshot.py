@@ -0,0 +1,87 @@
+import threading
+import time
+
+import pandas as pd
+
+from prime_tower import refresh, snapshot
+
+
+def _tables(tons):
+    operations = pd.DataFrame({"TruckID": ["T1"], "Ton Reg": [tons]})
+    return (operations,) + tuple(pd.DataFrame({"TruckID": ["T1"], "x": [1]}) for _ in range(4))
+
+
+def _store(tmp_path, fetches, modified):
+    def fetch():
+        fetches.append(1)
+        return _tables(30.0 + len(fetches))
+    return snapshot.SnapshotStore(fetch, directory=str(tmp_path), ttl=0, modified_time=lambda: modified[0])
+
+
+def test_ttl_refresh_skips_fetch_when_source_unchanged(tmp_path):
+    fetches, modified = [], [time.time() - 3600]
+    store = _store(tmp_path, fetches, modified)
+    version = store.refresh()
+    checked = snapshot.read_meta(str(tmp_path))["checked_at"]
+
+    store._background_refresh()
+    assert fetches == [1]
+    assert store.version() == version
+    assert snapshot.read_meta(str(tmp_path))["checked_at"] >= checked
+
+
+def test_ttl_refresh_fetches_when_source_changed(tmp_path):
+    fetches, modified = [], [time.time() - 3600]
+    store = _store(tmp_path, fetches, modified)
+    version = store.refresh()
+
+    modified[0] = time.time()
+    store._background_refresh()
+    assert fetches == [1, 1]
+    assert store.version() != version
+
+
+def test_ttl_refresh_fetches_when_check_fails(tmp_path):
+    fetches = []
+
+    def failing():
+        raise OSError("Drive unavailable")
+
+    store = snapshot.SnapshotStore(lambda: fetches.append(1) or _tables(30.0), directory=str(tmp_path), ttl=0,
+                                   modified_time=failing)
+    store.refresh()
+    store._background_refresh()
+    assert fetches == [1, 1]
+
+
+def test_scheduler_and_ttl_refresh_never_fetch_at_once(tmp_path):
+    active, peak, calls = [0], [0], []
+    lock, release = threading.Lock(), threading.Event()
+
+    def slow_fetch():
+        with lock:
+            calls.append(1)
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        if len(calls) > 1:
+            release.wait(5)
+        with lock:
+            active[0] -= 1
+        return _tables(30.0 + len(calls))
+
+    store = snapshot.SnapshotStore(slow_fetch, directory=str(tmp_path), ttl=0)
+    store.refresh()
+    scheduler = refresh.RefreshScheduler(store, lambda: time.time(), interval=0)
+
+    store.ensure_fresh()
+    while len(calls) < 2:
+        time.sleep(0.01)
+    assert scheduler.poll() is False
+    release.set()
+    while store._refreshing:
+        time.sleep(0.01)
+    assert peak[0] == 1
+    assert len(calls) == 2
+    # The skipped change is picked up by the next poll
+    assert scheduler.poll() is True
+    assert len(calls) == 3
@@ -0,0 +1,76 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from prime_tower.store import SharedStore
+
+
+def test_hits_share_one_frame():
+    store = SharedStore()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return pd.DataFrame({"TruckID": ["T1", "T2"], "Ton Reg": [30.5, 31.25]})
+
+    first = store.get_or_compute(("view", "2024-01"), compute)
+    second = store.get_or_compute(("view", "2024-01"), compute)
+    assert np.shares_memory(first["Ton Reg"].to_numpy(), second["Ton Reg"].to_numpy())
+    assert len(calls) == 1
+    assert store.stats()["bytes"] == int(first.memory_usage(deep=True).sum())
+
+
+def test_mutations_do_not_leak_to_other_sessions():
+    store = SharedStore()
+
+    def compute():
+        frame = pd.DataFrame({"TruckID": pd.Categorical(["T1", "T2"]), "Ton Reg": [30.5, 31.25]})
+        return {"top_truck": frame, "months": (frame,)}
+
+    mine = store.get_or_compute("alerts", compute)
+    mine["top_truck"].loc[0, "Ton Reg"] = 0.0
+    mine["top_truck"]["Ton Reg"] *= 100
+    mine["top_truck"]["Rank"] = [1, 2]
+    mine["months"][0].drop(columns="TruckID", inplace=True)
+    with pytest.raises(ValueError):
+        mine["top_truck"]["Ton Reg"].to_numpy()[0] = 1.0
+
+    theirs = store.get_or_compute("alerts", compute)
+    expected = pd.DataFrame({"TruckID": pd.Categorical(["T1", "T2"]), "Ton Reg": [30.5, 31.25]})
+    pd.testing.assert_frame_equal(theirs["top_truck"], expected)
+    pd.testing.assert_frame_equal(theirs["months"][0], expected)
+
+
+def test_concurrent_requests_compute_once():
+    store = SharedStore()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait()
+        return pd.DataFrame({"x": [1]})
+
+    threads = [threading.Thread(target=lambda: results.append(store.get_or_compute("k", compute))) for _ in range(4)]
+    threads[0].start()
+    started.wait()
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert all(np.shares_memory(result["x"].to_numpy(), results[0]["x"].to_numpy()) for result in results)
+
+
+def test_evicts_least_recently_used():
+    store = SharedStore(max_entries=2)
+    for key in ("a", "b", "c"):
+        store.get_or_compute(key, lambda: pd.DataFrame({"x": [1]}))
+    assert store.stats()["entries"] == 2
+    calls = []
+    store.get_or_compute("a", lambda: calls.append(1) or pd.DataFrame({"x": [1]}))
+    assert calls == [1]